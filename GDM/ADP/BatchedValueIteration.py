@@ -0,0 +1,132 @@
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from ..Graph import Graph, CompiledGraph
+from .Instrumentation import SolverCallback, SolverMonitor
+
+# Reorders C for backups of many utility columns at once. Nodes are sorted by
+# their number of actions (0 for terminal nodes), and actions are grouped by
+# their slot: every node's first action, then every second action, and so on.
+# Slot j then holds the actions of the first sizes[j] nodes, so the max over
+# actions is a few elementwise maximums of contiguous blocks, where reduceat
+# would loop over every node. Rows keep the order of their transitions, so
+# q-values match CompiledGraph.q_values exactly.
+def __slot_layout(C: CompiledGraph) -> Tuple[np.ndarray, csr_matrix, List[int]]:
+    counts = np.diff(C.action_offsets)
+    counts[C.terminal] = 0
+
+    order = np.argsort(-counts, kind='stable')
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order))
+
+    sizes = [int(np.count_nonzero(counts > j)) for j in range(counts.max(initial=0))]
+    actions = np.concatenate(
+        [C.action_offsets[order[:size]] + j for j, size in enumerate(sizes)]
+    ).astype(np.int64) if len(sizes) > 0 else np.zeros(0, dtype=np.int64)
+
+    lengths = np.diff(C.transition_offsets)[actions]
+    offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+    transitions = np.repeat(C.transition_offsets[actions] - offsets[:-1], lengths) + np.arange(offsets[-1])
+
+    P = csr_matrix(
+        (C.transition_probabilities[transitions], inverse[C.transition_targets[transitions]], offsets),
+        shape=(len(actions), C.node_count)
+    )
+    return order, P, sizes
+
+def __max_utility(q: np.ndarray, node_count: int, sizes: List[int]) -> np.ndarray:
+    u = np.zeros((node_count, q.shape[1]), dtype=np.float64)
+    if len(sizes) == 0:
+        return u
+
+    u[:sizes[0]] = q[:sizes[0]]
+    start = sizes[0]
+    for size in sizes[1:]:
+        np.maximum(u[:size], q[start:start + size], out=u[:size])
+        start += size
+
+    return u
+
+# Value iteration of K problems that share the transitions of C but differ in
+# their discount factor and/or rewards. gamma has K values, or one for all
+# problems, and reward is a (nodes x K) matrix, or None for the rewards of C.
+# Every sweep backs up all unconverged problems with one sparse product
+# against a (nodes x K) utility matrix, and a problem stops being backed up
+# once its own delta is below theta, exactly as if it were solved alone.
+#
+# Returns the (nodes x K) utilities and the (nodes x K) chosen actions, so
+# column k of the actions can be passed to CompiledGraph.policy.
+def compiled_batched_value_iteration(
+        C: CompiledGraph, max_iteration: int, gamma: Union[float, Sequence[float]],
+        theta: float, reward: np.ndarray=None,
+        callback: SolverCallback=None) -> Tuple[np.ndarray, np.ndarray]:
+
+    gamma = np.atleast_1d(np.asarray(gamma, dtype=np.float64))
+    if reward is None:
+        reward = C.reward[:, None]
+
+    assert reward.ndim == 2 and reward.shape[0] == C.node_count
+    K = np.broadcast_shapes(reward.shape[1:], gamma.shape)[0]
+    gamma = np.broadcast_to(gamma, (K,))
+    reward = np.broadcast_to(reward, (C.node_count, K))
+
+    order, P, sizes = __slot_layout(C)
+    utility = np.zeros((C.node_count, K), dtype=np.float64)
+
+    # the unconverged problems, with their rows in slot order
+    active = np.arange(K)
+    active_gamma = gamma.copy()
+    active_reward = np.ascontiguousarray(reward[order])
+    active_utility = np.zeros((C.node_count, K), dtype=np.float64)
+
+    monitor = SolverMonitor('batched_value_iteration', callback)
+    for _ in range(max_iteration):
+        u = __max_utility(P @ (active_reward + active_gamma*active_utility), C.node_count, sizes)
+        delta = np.max(np.abs(active_utility - u), axis=0, initial=0)
+        active_utility = u
+
+        backups = C.node_count * len(active)
+        converged = delta < theta
+        if converged.any():
+            utility[order[:, None], active[converged]] = active_utility[:, converged]
+            keep = ~converged
+            active = active[keep]
+            active_gamma = active_gamma[keep]
+            active_reward = np.ascontiguousarray(active_reward[:, keep])
+            active_utility = np.ascontiguousarray(active_utility[:, keep])
+
+        if monitor.report(delta.max(initial=0), backups) or len(active) == 0:
+            break
+
+    utility[order[:, None], active] = active_utility
+    return utility, C.best_actions(C.q_values(utility, gamma, reward))
+
+# Solves G once for every discount factor in gamma and/or every reward preset
+# in rewards (name -> reward, nodes missing from a preset keep their own
+# reward). When both are sequences they need the same length, problem k using
+# gamma[k] and rewards[k]; a single value is shared by all problems.
+#
+# The utilities of G are left untouched. Returns the policy and the utilities
+# of every problem, in order.
+def batched_value_iteration(
+        G: Graph, max_iteration: int, gamma: Union[float, Sequence[float]], theta: float,
+        rewards: Sequence[Dict[str, float]]=None,
+        callback: SolverCallback=None) -> Tuple[List[Dict[str, str]], List[Dict[str, float]]]:
+
+    C = G.compile()
+    reward = None
+    if rewards is not None:
+        reward = np.repeat(C.reward[:, None], len(rewards), axis=1)
+        for k, preset in enumerate(rewards):
+            for name, r in preset.items():
+                reward[C.index[name], k] = r
+
+    utility, actions = compiled_batched_value_iteration(C, max_iteration, gamma, theta, reward,
+                                                        callback)
+
+    names = C.names
+    policies = [C.policy(actions[:, k]) for k in range(actions.shape[1])]
+    utilities = [dict(zip(names, utility[:, k].tolist())) for k in range(utility.shape[1])]
+    return policies, utilities
@@ -0,0 +1,57 @@
+from dataclasses import dataclass, field
+from typing import Dict, Set, Tuple
+
+from ..Graph import Edge, Graph
+
+# Mutations made to a graph since it was last solved. Either fill the fields
+# directly after changing the graph, or route the changes through the methods
+# below, which apply them to the graph and record them in one step. Edges
+# whose probability lists are rewritten by Graph.remove_node are recorded in
+# changed_edges by remove_node.
+@dataclass
+class ChangeSet:
+    reward_deltas: Dict[str, float] = field(default_factory=dict)
+    added_edges: Set[Tuple[str, str]] = field(default_factory=set)
+    removed_edges: Set[Tuple[str, str]] = field(default_factory=set)
+    changed_edges: Set[Tuple[str, str]] = field(default_factory=set)
+    removed_nodes: Set[str] = field(default_factory=set)
+
+    def is_empty(self) -> bool:
+        return not (self.reward_deltas or self.added_edges or self.removed_edges
+                    or self.changed_edges or self.removed_nodes)
+
+    def clear(self):
+        self.reward_deltas.clear()
+        self.added_edges.clear()
+        self.removed_edges.clear()
+        self.changed_edges.clear()
+        self.removed_nodes.clear()
+
+    ##### Recording Mutations
+    def set_reward(self, G: Graph, node_name: str, reward: float):
+        node = G.get_node(node_name)
+        self.reward_deltas[node_name] = self.reward_deltas.get(node_name, 0) + reward - node.reward
+        node.reward = reward
+
+    def add_edge(self, G: Graph, edge: Edge):
+        G.add_edge(edge)
+        self.added_edges.add((edge.src, edge.tgt))
+
+    def remove_edge(self, G: Graph, src_name: str, tgt_name: str):
+        G.remove_edge(src_name, tgt_name)
+        self.removed_edges.add((src_name, tgt_name))
+
+    def remove_node(self, G: Graph, node_name: str):
+        for e in G.incoming_edges(node_name):
+            self.removed_edges.add((e.src, e.tgt))
+
+        for tgt in G.neighbors(node_name):
+            self.removed_edges.add((node_name, tgt))
+
+        for e in G.mentioning_edges(node_name):
+            key = (e.src, e.tgt)
+            if key not in self.removed_edges:
+                self.changed_edges.add(key)
+
+        G.remove_node(node_name)
+        self.removed_nodes.add(node_name)
@@ -0,0 +1,68 @@
+import json
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Callable, Optional
+
+# Reported by the solvers after every iteration (a sweep, a policy evaluation
+# and improvement, or a solved component for topological_value_iteration).
+# backups is the number of Bellman backups or evaluated nodes in the
+# iteration; delta and policy_changes are None for solvers that do not track
+# them.
+@dataclass
+class IterationEvent:
+    solver: str
+    iteration: int
+    delta: Optional[float]
+    backups: int
+    policy_changes: Optional[int]
+    elapsed: float
+
+# A solver callback gets every IterationEvent; returning True stops the
+# solver early, leaving the utilities and policy of the last iteration.
+SolverCallback = Callable[[IterationEvent], Optional[bool]]
+
+# Writes every event as one line of JSON. Use as the callback of a solver,
+# or as a context manager to close the file afterwards.
+class JSONLTrace:
+    def __init__(self, path: str, mode: str='a'):
+        self.file = open(path, mode)
+
+    def __call__(self, event: IterationEvent) -> bool:
+        self.file.write(json.dumps(asdict(event)))
+        self.file.write('\n')
+        return False
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self) -> 'JSONLTrace':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+# Used by the solvers to time iterations and build events. Without a callback
+# report does nothing, so solvers stay silent and skip any extra bookkeeping
+# when active is False.
+class SolverMonitor:
+    def __init__(self, solver: str, callback: SolverCallback=None):
+        self.solver = solver
+        self.callback = callback
+        self.active = callback is not None
+        self.iteration = 0
+        self.start = perf_counter()
+
+    def report(self, delta: Optional[float], backups: int, policy_changes: Optional[int]=None) -> bool:
+        if self.callback is None:
+            return False
+
+        event = IterationEvent(
+            self.solver,
+            self.iteration,
+            None if delta is None else float(delta),
+            int(backups),
+            None if policy_changes is None else int(policy_changes),
+            perf_counter() - self.start
+        )
+        self.iteration += 1
+        return bool(self.callback(event))
@@ -1,28 +1,28 @@
 # from networkx import set_node_attributes
 from typing import Dict
-from math import inf
-from ..Graph import Graph
 
-from ..utility import calculate_utility, calculate_max_utility, create_random_policy, reset_utility
+import numpy as np
+from scipy.sparse import csr_matrix, identity
+from scipy.sparse.linalg import LinearOperator, gmres, spilu, splu
+
+from ..Graph import Graph, CompiledGraph
+
+from ..utility import best_action, calculate_utility, calculate_max_utility, create_random_policy, reset_utility
+from .Instrumentation import SolverCallback, SolverMonitor
 
 ######################## Policy Evaluation ########################
+# Nodes without an action in pi, terminal nodes and dead ends, keep a utility
+# of 0.
 def __modified_in_place_policy_evaluation(G: Graph, pi: Dict[str, str], gamma: float, policy_k: int):
     for __ in range(policy_k):
-        for n in G.nodes:
-            node = G.get_node(n)
-            if node.is_terminal:
-                continue
-
-            node.utility = calculate_utility(G, n, pi[n], gamma)
+        for n, tgt in pi.items():
+            G.get_node(n).utility = calculate_utility(G, n, tgt, gamma)
 
 def __modified_policy_evaluation(G: Graph, pi: Dict[str, str], gamma: float, policy_k: int):
     for __ in range(policy_k):
         u_temp: Dict[str, float] = {}
-        for n in G.nodes:
-            if G.get_node(n).is_terminal:
-                continue
-            
-            u_temp[n] = calculate_utility(G, n, pi[n], gamma)
+        for n, tgt in pi.items():
+            u_temp[n] = calculate_utility(G, n, tgt, gamma)
         
         G.set_node_utilities(u_temp)
 
@@ -40,35 +40,128 @@ def __policy_evaluation(G: Graph, _, gamma: float, policy_k: int):
         G.set_node_utilities(u_temp)
 
 ######################## Policy Improvement ########################
-def __policy_improvement(G: Graph, pi: Dict[str, str], gamma: float) -> bool:
-    changed = False
+# returns the number of nodes whose action changed
+def __policy_improvement(G: Graph, pi: Dict[str, str], gamma: float) -> int:
+    changed = 0
     for n in G.nodes:
-        if G.get_node(n).is_terminal:
-            continue
+        # terminal nodes and dead ends have no action
+        best_s, _ = best_action(G, n, gamma)
+        if best_s is not None and pi.get(n) != best_s:
+            pi[n] = best_s
+            changed += 1
 
-        best_s = None
-        best_u = -inf
-        for n_p in G.neighbors(n):
-            u_p = calculate_utility(G, n, n_p, gamma)
+    return changed
 
-            if u_p > best_u:
-                best_s = n_p
-                best_u = u_p
+######################## Exact Policy Evaluation ########################
+# Solves (I - gamma P_pi) u = P_pi r where row n of P_pi is the outcome
+# distribution of pi[n]. Terminal nodes and nodes without neighbors have an
+# empty row so their utility is 0.
+#
+# solver='direct' factorizes with a sparse LU, solver='iterative' runs GMRES
+# preconditioned with an incomplete LU. Either way the factorization is kept
+# between iterations: when only a few rows of P_pi changed, the previous one is
+# a near exact preconditioner and the previous utilities a near exact starting
+# point, so a handful of GMRES steps replaces a new factorization.
+class __ExactPolicyEvaluation:
+    def __init__(self, C: CompiledGraph, gamma: float, solver: str, refactor_fraction: float):
+        assert solver in ('direct', 'iterative')
+        self.C = C
+        self.gamma = gamma
+        self.solver = solver
+        self.refactor_fraction = refactor_fraction
+        self.lu = None
+        self.actions: np.ndarray = None
+
+    def __call__(self, actions: np.ndarray, u: np.ndarray) -> np.ndarray:
+        C = self.C
+        rows = np.flatnonzero(actions >= 0)
+        select = csr_matrix(
+            (np.ones(len(rows)), (rows, actions[rows])),
+            shape=(C.node_count, C.action_count)
+        )
+        P_pi = select @ C.transition_matrix
+        A = (identity(C.node_count, format='csr') - self.gamma*P_pi).tocsc()
+        b = P_pi @ C.reward
+
+        if self.lu is not None:
+            changed = np.count_nonzero(actions != self.actions)
+            if changed <= self.refactor_fraction*C.node_count:
+                v, info = self.__gmres(A, b, u)
+                if info == 0:
+                    self.actions = actions.copy()
+                    return v
+
+        self.actions = actions.copy()
+        if self.solver == 'direct':
+            self.lu = splu(A)
+            return self.lu.solve(b)
+
+        self.lu = spilu(A)
+        v, info = self.__gmres(A, b, u)
+        assert info == 0, f'GMRES did not converge (info={info})'
+        return v
+
+    def __gmres(self, A, b: np.ndarray, u: np.ndarray):
+        M = LinearOperator(A.shape, matvec=self.lu.solve)
+        return gmres(A, b, x0=u, M=M, rtol=1e-12, atol=0)
+
+# Runs on a CompiledGraph directly, leaving the utilities in C.utility and
+# returning the chosen action of every node (see CompiledGraph.policy).
+def compiled_policy_iteration(C: CompiledGraph, gamma: float, solver: str='direct',
+                              refactor_fraction: float=0.05,
+                              should_reset_utility: bool=True,
+                              callback: SolverCallback=None) -> np.ndarray:
+    if should_reset_utility:
+        C.utility[:] = 0
 
-        if pi[n] != best_s:
-            pi[n] = best_s
-            changed = True
+    evaluate = __ExactPolicyEvaluation(C, gamma, solver, refactor_fraction)
+    monitor = SolverMonitor('compiled_policy_iteration', callback)
 
-    return changed
+    # start from the greedy policy on the current utilities
+    u = C.utility
+    actions = C.best_actions(C.q_values(u, gamma))
+
+    while True:
+        u_previous = u
+        u = evaluate(actions, u)
+        q = C.q_values(u, gamma)
+        best = C.best_actions(q)
+
+        # only switch actions that are strictly better so round off in the
+        # solve cannot make the policy oscillate between tied actions
+        has_action = actions >= 0
+        improved = np.zeros(C.node_count, dtype=bool)
+        improved[has_action] = q[best[has_action]] > q[actions[has_action]] + 1e-12*(1 + np.abs(u[has_action]))
+        changes = np.count_nonzero(improved)
+
+        delta = np.max(np.abs(u - u_previous), initial=0) if monitor.active else None
+        if monitor.report(delta, C.node_count, changes) or changes == 0:
+            break
+
+        actions[improved] = best[improved]
+
+    C.utility[:] = u
+    return C.best_actions(q)
 
 ######################## Policy Iteration ########################
+# callback is given an IterationEvent after every evaluation and improvement
+# and can stop the solver early by returning True, see Instrumentation.
 def policy_iteration(G: Graph, gamma: float, modified: bool=False, 
                      in_place: bool=False, policy_k: int=10, 
-                     should_reset_utility: bool=True) -> Dict[str, str]:
+                     should_reset_utility: bool=True, exact: bool=False,
+                     solver: str='direct', refactor_fraction: float=0.05,
+                     callback: SolverCallback=None) -> Dict[str, str]:
     # reset utility
     if should_reset_utility:
         reset_utility(G) 
 
+    # exact evaluation ignores modified, in_place, and policy_k
+    if exact:
+        C = G.compile()
+        actions = compiled_policy_iteration(C, gamma, solver, refactor_fraction, False, callback)
+        C.set_node_utilities(G)
+        return C.policy(actions)
+
     # make random policy
     pi = create_random_policy(G)
 
@@ -83,9 +176,14 @@ def policy_iteration(G: Graph, gamma: float, modified: bool=False,
         policy_eval = __policy_evaluation
 
     # run policy iteration
+    monitor = SolverMonitor('policy_iteration', callback)
     while True:
+        u_previous = {n: node.utility for n, node in G.nodes.items()} if monitor.active else None
         policy_eval(G, pi, gamma, policy_k)
-        if not __policy_improvement(G, pi, gamma):
+        changes = __policy_improvement(G, pi, gamma)
+
+        delta = max((abs(G.utility(n) - u) for n, u in u_previous.items()), default=0) if monitor.active else None
+        if monitor.report(delta, policy_k*len(G.nodes), changes) or changes == 0:
             break
     
     policy_eval(G, pi, gamma, policy_k)
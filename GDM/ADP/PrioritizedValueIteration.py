@@ -0,0 +1,112 @@
+from heapq import heappop, heappush
+from typing import Dict, Iterable, List, Set, Tuple
+
+from ..utility import reset_utility, create_policy, calculate_max_utility, best_action
+from ..Graph import Graph
+from .ChangeSet import ChangeSet
+from .Instrumentation import SolverCallback, SolverMonitor
+
+# An iteration is reported after every len(G.nodes) backups, the work of one
+# sweep, and once more when the queue runs dry. delta is the largest Bellman
+# error still queued.
+def __prioritized_sweep(G: Graph, gamma: float, theta: float, seeds: Iterable[str],
+                        max_backups: int, monitor: SolverMonitor) -> Set[str]:
+    priority: Dict[str, float] = {}
+    queue: List[Tuple[float, str]] = []
+
+    def push(n: str):
+        error = abs(calculate_max_utility(G, n, gamma) - G.utility(n))
+        if error >= theta and error > priority.get(n, 0):
+            priority[n] = error
+            heappush(queue, (-error, n))
+
+    for n in seeds:
+        push(n)
+
+    updated: Set[str] = set()
+    backups = 0
+    reported = 0
+    sweep = max(len(G.nodes), 1)
+    while len(queue) > 0 and (max_backups is None or backups < max_backups):
+        error, n = heappop(queue)
+        if priority.get(n) != -error:
+            continue  # stale entry, the node was re-queued with a new error
+
+        del priority[n]
+        G.get_node(n).utility = calculate_max_utility(G, n, gamma)
+        updated.add(n)
+        backups += 1
+
+        # only the nodes whose edges can transition to n depend on its utility
+        for n_p in G.predecessors(n):
+            push(n_p)
+
+        if monitor.active and backups - reported == sweep:
+            reported = backups
+            if monitor.report(max(priority.values(), default=0), sweep):
+                return updated
+
+    if monitor.active and backups > reported:
+        monitor.report(max(priority.values(), default=0), backups - reported)
+
+    return updated
+
+def prioritized_value_iteration(
+        G: Graph, gamma: float, theta: float, max_backups: int=None,
+        should_reset_utility: bool=True, callback: SolverCallback=None) -> Dict[str, str]:
+
+    if should_reset_utility:
+        reset_utility(G)
+
+    monitor = SolverMonitor('prioritized_value_iteration', callback)
+    __prioritized_sweep(G, gamma, theta, G.nodes, max_backups, monitor)
+    return create_policy(G, gamma)
+
+######################## Incremental Re-solve ########################
+def __dirty_nodes(G: Graph, changes: ChangeSet, pi: Dict[str, str]) -> Set[str]:
+    dirty: Set[str] = set()
+
+    # a reward only enters the utility of the nodes that can transition to it
+    for n, delta in changes.reward_deltas.items():
+        if delta != 0:
+            dirty.update(G.predecessors(n))
+
+    for src, _ in changes.added_edges | changes.removed_edges | changes.changed_edges:
+        dirty.add(src)
+
+    for n, tgt in pi.items():
+        if tgt in changes.removed_nodes:
+            dirty.add(n)
+
+    return {n for n in dirty if n in G.nodes}
+
+# Warm starts from the utilities already stored in G and the policy pi found
+# for the graph before the changes, and only backs up nodes whose Bellman
+# error is affected by the changes. The caller is expected to clear the
+# ChangeSet once the new policy has been taken.
+def incremental_value_iteration(
+        G: Graph, gamma: float, theta: float, changes: ChangeSet,
+        pi: Dict[str, str], max_backups: int=None,
+        callback: SolverCallback=None) -> Dict[str, str]:
+
+    dirty = __dirty_nodes(G, changes, pi)
+    monitor = SolverMonitor('incremental_value_iteration', callback)
+    updated = __prioritized_sweep(G, gamma, theta, dirty, max_backups, monitor)
+
+    # the best action of a node can only change if the graph changed under it
+    # or the utility of one of its outcomes changed
+    affected = set(dirty)
+    for n in updated:
+        affected.update(G.predecessors(n))
+
+    pi = {n: tgt for n, tgt in pi.items() if n in G.nodes}
+    # terminal nodes and dead ends, e.g. a node whose last edge was removed,
+    # have a utility of 0 and no action
+    for n in affected:
+        best_n, _ = best_action(G, n, gamma)
+        if best_n is None:
+            pi.pop(n, None)
+        else:
+            pi[n] = best_n
+
+    return pi
@@ -0,0 +1,67 @@
+from typing import Dict, List, Set, Tuple
+
+from ..Analytics import strongly_connected_components
+from ..utility import reset_utility, create_policy, calculate_max_utility
+from ..Graph import Graph
+from .Instrumentation import SolverCallback, SolverMonitor
+
+# The nodes a node's utility depends on: the outcomes of its edges. Terminal
+# nodes have a utility of 0 and depend on nothing.
+def __outcomes(G: Graph) -> Dict[str, Set[str]]:
+    outcomes: Dict[str, Set[str]] = {}
+    for n, node in G.nodes.items():
+        outcomes[n] = set() if node.is_terminal else {
+            name
+            for tgt in node.neighbors
+            for name, _ in G.get_edge(n, tgt).probability
+        }
+
+    return outcomes
+
+# returns the last delta and the number of backups
+def __solve_component(G: Graph, component: List[str], max_iteration: int, gamma: float,
+                      theta: float) -> Tuple[float, int]:
+    backups = 0
+    delta = 0
+    for _ in range(max_iteration):
+        delta = 0
+        for n in component:
+            node = G.get_node(n)
+            u = calculate_max_utility(G, n, gamma)
+            delta = max(delta, abs(node.utility - u))
+            node.utility = u
+
+        backups += len(component)
+        if delta < theta:
+            break
+
+    return delta, backups
+
+# Value iteration one strongly connected component at a time. Components come
+# in reverse topological order, so the utilities a component depends on are
+# final by the time it is solved: a single node without a self loop needs one
+# backup, and only components with cycles are iterated, until their own
+# delta is below theta. An iteration is reported for every component.
+def topological_value_iteration(
+        G: Graph, max_iteration: int, gamma: float, theta: float,
+        should_reset_utility: bool=True, callback: SolverCallback=None) -> Dict[str, str]:
+
+    if should_reset_utility:
+        reset_utility(G)
+
+    monitor = SolverMonitor('topological_value_iteration', callback)
+    outcomes = __outcomes(G)
+    for component in strongly_connected_components(G, outcomes.__getitem__):
+        if len(component) == 1 and component[0] not in outcomes[component[0]]:
+            node = G.get_node(component[0])
+            u = calculate_max_utility(G, node.name, gamma)
+            delta = abs(node.utility - u)
+            backups = 1
+            node.utility = u
+        else:
+            delta, backups = __solve_component(G, component, max_iteration, gamma, theta)
+
+        if monitor.report(delta, backups):
+            break
+
+    return create_policy(G, gamma)
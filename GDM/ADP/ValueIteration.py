@@ -1,10 +1,14 @@
 from typing import Dict
 
+import numpy as np
+
 from ..utility import reset_utility, create_policy, calculate_max_utility
-from ..Graph import Graph
+from ..Graph import Graph, CompiledGraph
+from .Instrumentation import SolverCallback, SolverMonitor
 
-def __in_place_value_iteration(G: Graph, max_iteration: int, gamma: float, theta: float):
-    for k in range(max_iteration):
+def __in_place_value_iteration(G: Graph, max_iteration: int, gamma: float, theta: float,
+                               monitor: SolverMonitor):
+    for _ in range(max_iteration):
         delta = 0
 
         for n in G.nodes:
@@ -13,13 +17,11 @@ def __in_place_value_iteration(G: Graph, max_iteration: int, gamma: float, theta
             delta = max(delta, abs(node.utility - u))
             node.utility = u
 
-        print(f'delta={delta}')
-        if delta < theta:
+        if monitor.report(delta, len(G.nodes)) or delta < theta:
             break
-            
-    print(f'{k} iterations to converge.')
 
-def __value_iteration(G: Graph, max_iteration: int, gamma: float, theta: float):
+def __value_iteration(G: Graph, max_iteration: int, gamma: float, theta: float,
+                      monitor: SolverMonitor):
     for _ in range(max_iteration):
         delta = 0
         u_temp: Dict[str, float] = {}
@@ -31,20 +33,92 @@ def __value_iteration(G: Graph, max_iteration: int, gamma: float, theta: float):
         
         G.set_node_utilities(u_temp)
 
-        if delta < theta:
+        if monitor.report(delta, len(G.nodes)) or delta < theta:
+            break
+
+######################## NumPy Backend ########################
+# Gauss-Seidel over blocks of nodes: every block is backed up with a single
+# sparse product against utilities that already include earlier blocks.
+def __numpy_in_place_value_iteration(C: CompiledGraph, max_iteration: int, gamma: float,
+                                     theta: float, block_size: int, monitor: SolverMonitor):
+    P = C.transition_matrix
+    u = C.utility
+    x = C.reward + gamma*u
+
+    blocks = []
+    for start in range(0, C.node_count, block_size):
+        end = min(start + block_size, C.node_count)
+        P_block = P[C.action_offsets[start]:C.action_offsets[end]]
+        blocks.append((start, end, P_block))
+
+    for _ in range(max_iteration):
+        delta = 0
+
+        for start, end, P_block in blocks:
+            u_block = C.max_utility(P_block @ x, start, end)
+            if end > start:
+                delta = max(delta, np.max(np.abs(u[start:end] - u_block)))
+
+            u[start:end] = u_block
+            x[start:end] = C.reward[start:end] + gamma*u_block
+
+        if monitor.report(delta, C.node_count) or delta < theta:
             break
 
+def __numpy_value_iteration(C: CompiledGraph, max_iteration: int, gamma: float, theta: float,
+                            monitor: SolverMonitor):
+    for _ in range(max_iteration):
+        u = C.max_utility(C.q_values(C.utility, gamma))
+        delta = np.max(np.abs(C.utility - u), initial=0)
+        C.utility[:] = u
+
+        if monitor.report(delta, C.node_count) or delta < theta:
+            break
+
+# Runs on a CompiledGraph directly, e.g. one memory mapped by
+# GDM.IO.read_graph_binary, leaving the utilities in C.utility and returning
+# the chosen action of every node (see CompiledGraph.policy).
+def compiled_value_iteration(
+        C: CompiledGraph, max_iteration: int, gamma: float, theta: float,
+        in_place: bool=False, should_reset_utility: bool=True,
+        block_size: int=1024, callback: SolverCallback=None) -> np.ndarray:
+
+    if should_reset_utility:
+        C.utility[:] = 0
+
+    monitor = SolverMonitor('compiled_value_iteration', callback)
+    if in_place:
+        __numpy_in_place_value_iteration(C, max_iteration, gamma, theta, block_size, monitor)
+    else:
+        __numpy_value_iteration(C, max_iteration, gamma, theta, monitor)
+
+    return C.best_actions(C.q_values(C.utility, gamma))
+
+######################## Value Iteration ########################
+# callback is given an IterationEvent after every sweep and can stop the
+# solver early by returning True, see Instrumentation.
 def value_iteration(
         G: Graph, max_iteration: int, gamma: float, theta: float, 
-        in_place: bool=False, should_reset_utility: bool=True) -> Dict[str, str]:
+        in_place: bool=False, should_reset_utility: bool=True,
+        backend: str='python', block_size: int=1024,
+        callback: SolverCallback=None) -> Dict[str, str]:
+    assert backend in ('python', 'numpy')
             
     if should_reset_utility:
         reset_utility(G)
 
+    if backend == 'numpy':
+        C = G.compile()
+        actions = compiled_value_iteration(C, max_iteration, gamma, theta, in_place, False,
+                                           block_size, callback)
+        C.set_node_utilities(G)
+        return C.policy(actions)
+
+    monitor = SolverMonitor('value_iteration', callback)
     if in_place:
-        __in_place_value_iteration(G, max_iteration, gamma, theta)
+        __in_place_value_iteration(G, max_iteration, gamma, theta, monitor)
     else:
-        __value_iteration(G, max_iteration, gamma, theta)
+        __value_iteration(G, max_iteration, gamma, theta, monitor)
 
     return create_policy(G, gamma)
 
@@ -1,2 +1,7 @@
-from .PolicyIteration import policy_iteration
-from .ValueIteration import value_iteration
\ No newline at end of file
+from .BatchedValueIteration import batched_value_iteration, compiled_batched_value_iteration
+from .ChangeSet import ChangeSet
+from .Instrumentation import IterationEvent, JSONLTrace, SolverCallback
+from .PolicyIteration import policy_iteration, compiled_policy_iteration
+from .PrioritizedValueIteration import prioritized_value_iteration, incremental_value_iteration
+from .TopologicalValueIteration import topological_value_iteration
+from .ValueIteration import value_iteration, compiled_value_iteration
\ No newline at end of file
@@ -0,0 +1,56 @@
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Set
+
+from ..Graph import Graph
+
+# Shortest number of edges from start to every node it can reach. Nodes
+# start cannot reach are left out.
+def bfs_depths(G: Graph, start: str='start') -> Dict[str, int]:
+    assert start in G.nodes
+
+    depth: Dict[str, int] = {start: 0}
+    queue = deque([start])
+    while len(queue) > 0:
+        name = queue.popleft()
+        for neighbor in G.neighbors(name):
+            if neighbor not in depth:
+                depth[neighbor] = depth[name] + 1
+                queue.append(neighbor)
+
+    return depth
+
+def reachable(G: Graph, start: str='start') -> Set[str]:
+    return set(bfs_depths(G, start))
+
+def unreachable(G: Graph, start: str='start') -> List[str]:
+    depth = bfs_depths(G, start)
+    return [name for name in G.nodes if name not in depth]
+
+# Non-terminal nodes without neighbors. A policy has no action for them, and
+# create_random_policy fails on them.
+def dead_ends(G: Graph) -> List[str]:
+    return [name for name, n in G.nodes.items() if not n.is_terminal and len(n.neighbors) == 0]
+
+# Non-terminal nodes from which no terminal node can be reached, found by
+# walking backward from the terminal nodes. successors defaults to the
+# neighbors of a node; pass one returning edge outcomes to follow the
+# transitions instead.
+def traps(G: Graph, successors: Callable[[str], Iterable[str]]=None) -> List[str]:
+    if successors is None:
+        successors = G.neighbors
+
+    predecessors: Dict[str, List[str]] = {name: [] for name in G.nodes}
+    for name in G.nodes:
+        for tgt in successors(name):
+            predecessors[tgt].append(name)
+
+    escapes: Set[str] = {name for name, n in G.nodes.items() if n.is_terminal}
+    queue = deque(escapes)
+    while len(queue) > 0:
+        name = queue.popleft()
+        for src in predecessors[name]:
+            if src not in escapes:
+                escapes.add(src)
+                queue.append(src)
+
+    return [name for name in G.nodes if name not in escapes]
@@ -0,0 +1,64 @@
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from ..Graph import Graph
+
+# Tarjan's algorithm with an explicit stack instead of recursion, so deep level
+# graphs do not hit the recursion limit. Components are returned in reverse
+# topological order: no component has an edge into a later one. successors
+# defaults to the neighbors of a node; solvers should pass one returning the
+# outcomes of a node's edges, since those are what utilities depend on.
+def strongly_connected_components(G: Graph,
+                                  successors: Callable[[str], Iterable[str]]=None) -> List[List[str]]:
+    if successors is None:
+        successors = G.neighbors
+
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack: Dict[str, bool] = {}
+    stack: List[str] = []
+    components: List[List[str]] = []
+
+    for root in G.nodes:
+        if root in index:
+            continue
+
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack[root] = True
+        work: List[Tuple[str, Iterator[str]]] = [(root, iter(successors(root)))]
+
+        while len(work) > 0:
+            name, children = work[-1]
+
+            descended = False
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack[child] = True
+                    work.append((child, iter(successors(child))))
+                    descended = True
+                    break
+                elif on_stack[child]:
+                    low[name] = min(low[name], index[child])
+
+            if descended:
+                continue
+
+            work.pop()
+            if len(work) > 0:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[name])
+
+            if low[name] == index[name]:
+                component: List[str] = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == name:
+                        break
+
+                components.append(component)
+
+    return components
@@ -0,0 +1,2 @@
+from .Reachability import bfs_depths, reachable, unreachable, dead_ends, traps
+from .StronglyConnectedComponents import strongly_connected_components
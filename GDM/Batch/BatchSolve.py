@@ -0,0 +1,146 @@
+import json
+import os
+import random
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from itertools import product
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, List
+
+from ..ADP import policy_iteration, value_iteration
+from ..Baseline import greed_policy, random_policy
+from ..Cache import SolverCache
+from ..Graph import Graph
+from ..IO import read_graph_json
+
+# One point of a parameter grid. gamma and theta are ignored by the solvers
+# that do not use them.
+@dataclass(frozen=True)
+class SolveConfig:
+    solver: str
+    gamma: float
+    theta: float
+    max_iteration: int = 1000
+    backend: str = 'python'
+    seed: int = None
+
+def __run(cache: SolverCache, solver: Callable[..., Dict[str, str]], G: Graph, **params) -> Dict[str, str]:
+    if cache is None:
+        return solver(G, **params)
+
+    return cache.solve(solver, G, **params)
+
+def __value_iteration(G: Graph, config: SolveConfig, cache: SolverCache) -> Dict[str, str]:
+    return __run(cache, value_iteration, G, max_iteration=config.max_iteration,
+                 gamma=config.gamma, theta=config.theta, backend=config.backend)
+
+def __policy_iteration(G: Graph, config: SolveConfig, cache: SolverCache) -> Dict[str, str]:
+    return __run(cache, policy_iteration, G, gamma=config.gamma, exact=config.backend == 'numpy')
+
+# baselines are cheap, and random_policy should not be replayed
+def __random_policy(G: Graph, config: SolveConfig, cache: SolverCache) -> Dict[str, str]:
+    return random_policy(G)
+
+def __greed_policy(G: Graph, config: SolveConfig, cache: SolverCache) -> Dict[str, str]:
+    return greed_policy(G)
+
+SOLVERS: Dict[str, Callable[[Graph, SolveConfig, SolverCache], Dict[str, str]]] = {
+    'value_iteration': __value_iteration,
+    'policy_iteration': __policy_iteration,
+    'random_policy': __random_policy,
+    'greed_policy': __greed_policy,
+}
+
+# solvers whose utilities are meaningful after they ran
+UTILITY_SOLVERS = {'value_iteration', 'policy_iteration'}
+
+# graph.json files given directly or found anywhere below given directories
+def find_graphs(paths: Iterable[str]) -> List[str]:
+    graphs: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                if 'graph.json' in files:
+                    graphs.append(os.path.join(root, 'graph.json'))
+        else:
+            graphs.append(path)
+
+    return sorted(graphs)
+
+def config_grid(solvers: Iterable[str], gammas: Iterable[float], thetas: Iterable[float],
+                **kwargs) -> List[SolveConfig]:
+    return [
+        SolveConfig(solver, gamma, theta, **kwargs)
+        for solver, gamma, theta in product(solvers, gammas, thetas)
+    ]
+
+# Loads the graph once and runs every config on it. A failure is recorded in
+# the result instead of ending the batch.
+def __solve_graph(path: str, configs: List[SolveConfig], cache_dir: str,
+                  cache_bytes: int) -> List[Dict[str, Any]]:
+    results: List[Dict[str, Any]] = []
+    cache = None if cache_dir is None else SolverCache(cache_dir, cache_bytes)
+    try:
+        start = perf_counter()
+        G = read_graph_json(path)
+        load_seconds = perf_counter() - start
+    except Exception:
+        return [{'graph': path, **asdict(config), 'error': traceback.format_exc()} for config in configs]
+
+    for config in configs:
+        result: Dict[str, Any] = {'graph': path, **asdict(config), 'load_seconds': load_seconds}
+        try:
+            if config.seed is not None:
+                random.seed(config.seed)
+
+            for node in G.nodes.values():
+                node.utility = 0
+
+            start = perf_counter()
+            hits = 0 if cache is None else cache.stats.hits
+            pi = SOLVERS[config.solver](G, config, cache)
+            result['seconds'] = perf_counter() - start
+            result['cached'] = cache is not None and cache.stats.hits > hits
+            result['policy'] = pi
+            if config.solver in UTILITY_SOLVERS:
+                result['utilities'] = {name: node.utility for name, node in G.nodes.items()}
+        except Exception:
+            result['error'] = traceback.format_exc()
+
+        results.append(result)
+
+    return results
+
+# Solves every graph with every config, one graph per task, and writes one JSON
+# line per (graph, config) to output as graphs finish, so the results of a
+# long sweep are kept even if it is cut short. With cache_dir, solver results
+# are kept in a SolverCache there and unchanged graphs are not solved again.
+# Returns the number of failed solves.
+def batch_solve(graphs: List[str], configs: List[SolveConfig], output: str,
+                processes: int=None, cache_dir: str=None,
+                cache_bytes: int=256*1024*1024) -> int:
+    for config in configs:
+        assert config.solver in SOLVERS, f'unknown solver {config.solver}'
+
+    failures = 0
+    with open(output, 'w') as f:
+        def write(results: List[Dict[str, Any]]):
+            nonlocal failures
+            for result in results:
+                failures += 'error' in result
+                f.write(json.dumps(result))
+                f.write('\n')
+
+            f.flush()
+
+        if processes == 1:
+            for path in graphs:
+                write(__solve_graph(path, configs, cache_dir, cache_bytes))
+        else:
+            with ProcessPoolExecutor(processes) as pool:
+                futures = [pool.submit(__solve_graph, path, configs, cache_dir, cache_bytes) for path in graphs]
+                for future in as_completed(futures):
+                    write(future.result())
+
+    return failures
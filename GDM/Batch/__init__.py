@@ -0,0 +1 @@
+from .BatchSolve import SOLVERS, SolveConfig, batch_solve, config_grid, find_graphs
@@ -0,0 +1,20 @@
+from hashlib import sha256
+
+from ..Graph import Graph
+
+# Stable content hash of everything a solver reads: node names, rewards, and
+# terminal flags, and the edges with their probabilities. Nodes, edges, and
+# outcomes are sorted and floats written exactly, so the hash does not depend
+# on insertion order, set order, or the process. Utilities are left out.
+def graph_hash(G: Graph) -> str:
+    h = sha256()
+    for name in sorted(G.nodes):
+        node = G.nodes[name]
+        h.update(f'n{len(name)}:{name}{float(node.reward).hex()}{int(node.is_terminal)}'.encode())
+
+    for src, tgt in sorted(G.edges):
+        h.update(f'e{len(src)}:{src}{len(tgt)}:{tgt}'.encode())
+        for name, p in sorted(G.edges[(src, tgt)].probability):
+            h.update(f'o{len(name)}:{name}{float(p).hex()}'.encode())
+
+    return h.hexdigest()
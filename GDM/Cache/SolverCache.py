@@ -0,0 +1,117 @@
+import json
+import os
+from dataclasses import dataclass
+from hashlib import sha256
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..Graph import Graph
+from ..IO.AtomicFile import atomic_write
+from .GraphHash import graph_hash
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+# On disk cache of solver results, one JSON file per (graph hash, solver,
+# parameters) in directory. A hit refreshes the file's modification time and
+# the least recently used files are removed once the directory holds more than
+# max_bytes. Files are written atomically, so processes can share a directory.
+#
+#   cache = SolverCache('.gdm-cache')
+#   pi = cache.solve(value_iteration, G, max_iteration=1000, gamma=0.95, theta=1e-6)
+class SolverCache:
+    def __init__(self, directory: str, max_bytes: int=256*1024*1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, G: Graph, solver: str, params: Dict[str, Any]) -> str:
+        h = sha256(graph_hash(G).encode())
+        h.update(solver.encode())
+        h.update(json.dumps(params, sort_keys=True, default=repr).encode())
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, float], Dict[str, str]]]:
+        path = self.__path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+
+            os.utime(path)
+        except (FileNotFoundError, json.JSONDecodeError):
+            # missing, or evicted by another process while being read
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        return entry['utilities'], entry['policy']
+
+    def put(self, key: str, utilities: Dict[str, float], policy: Dict[str, str]):
+        with atomic_write(self.__path(key)) as f:
+            json.dump({'utilities': utilities, 'policy': policy}, f)
+
+        self.__evict()
+
+    # Runs solver(G, **params) unless an equal graph was solved with the same
+    # solver and parameters before; either way the utilities end up in G and
+    # the policy is returned. callback is not part of the key. A solver warm
+    # started with should_reset_utility=False depends on the utilities in G,
+    # so it always runs.
+    def solve(self, solver: Callable[..., Dict[str, str]], G: Graph, **params) -> Dict[str, str]:
+        if not params.get('should_reset_utility', True):
+            return solver(G, **params)
+
+        key = self.key(G, solver.__name__, {k: v for k, v in params.items() if k != 'callback'})
+        cached = self.get(key)
+        if cached is not None:
+            utilities, policy = cached
+            G.set_node_utilities(utilities)
+            return policy
+
+        policy = solver(G, **params)
+        self.put(key, {name: node.utility for name, node in G.nodes.items()}, policy)
+        return policy
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json'):
+                os.remove(entry.path)
+
+    def size(self) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.name.endswith('.json'))
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.json')
+
+    def __evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.json'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+
+            try:
+                os.remove(path)
+                self.stats.evictions += 1
+            except FileNotFoundError:
+                pass
+
+            total -= size
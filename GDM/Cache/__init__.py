@@ -0,0 +1,2 @@
+from .GraphHash import graph_hash
+from .SolverCache import CacheStats, SolverCache
@@ -0,0 +1,37 @@
+from random import random
+from typing import List, Tuple
+
+# Walker/Vose alias table: O(k) to build, O(1) per sample. Built once per
+# probability list, which is checked to be a distribution at that point.
+class AliasTable:
+    def __init__(self, probability: List[Tuple[str, float]], tolerance: float=1e-9):
+        total = sum(p for _, p in probability)
+        assert len(probability) > 0, 'cannot sample from an empty probability list'
+        assert all(p >= 0 for _, p in probability), f'negative probability in {probability}'
+        assert abs(total - 1) <= tolerance, f'probabilities sum to {total} instead of 1: {probability}'
+
+        k = len(probability)
+        self.outcomes: List[str] = [name for name, _ in probability]
+        self.threshold: List[float] = [1.0] * k
+        self.alias: List[int] = list(range(k))
+
+        scaled = [p * k / total for _, p in probability]
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while len(small) > 0 and len(large) > 0:
+            s = small.pop()
+            l = large.pop()
+
+            self.threshold[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1 - scaled[s]
+
+            if scaled[l] < 1:
+                small.append(l)
+            else:
+                large.append(l)
+
+    def sample(self) -> str:
+        u = random() * len(self.outcomes)
+        i = int(u)
+        return self.outcomes[i] if u - i < self.threshold[i] else self.outcomes[self.alias[i]]
@@ -0,0 +1,64 @@
+from array import array
+from dataclasses import dataclass, field
+from sys import intern
+from typing import List, Tuple
+
+from .AliasTable import AliasTable
+
+# Slotted counterpart of Edge used by CompactGraph. Outcomes are stored as a
+# tuple of interned names next to a packed array of probabilities instead of
+# a list of (str, float) tuples. The probability property rebuilds the list on
+# access, so hot loops should run on Graph.compile() instead.
+@dataclass(slots=True, init=False)
+class CompactEdge:
+    src: str
+    tgt: str
+    outcomes: Tuple[str, ...]
+    probabilities: array
+    _sampler: AliasTable = field(repr=False, compare=False)
+    _expected_reward: float = field(repr=False, compare=False)
+    _reward_version: int = field(repr=False, compare=False)
+
+    def __init__(self, src: str, tgt: str, probability: List[Tuple[str, float]]):
+        self._sampler = None
+        self._expected_reward = 0.0
+        self._reward_version = -1
+        self.src = intern(src)
+        self.tgt = intern(tgt)
+        self.probability = probability
+
+    @property
+    def probability(self) -> List[Tuple[str, float]]:
+        return list(zip(self.outcomes, self.probabilities))
+
+    @probability.setter
+    def probability(self, probability: List[Tuple[str, float]]):
+        self.outcomes = tuple(intern(name) for name, _ in probability)
+        self.probabilities = array('d', (p for _, p in probability))
+        self._sampler = None
+        self._reward_version = -1
+
+    # see Edge.expected_reward
+    def expected_reward(self, G) -> float:
+        version = G.reward_version
+        if self._reward_version != version:
+            nodes = G.nodes
+            self._expected_reward = sum(p * nodes[name].reward for name, p in zip(self.outcomes, self.probabilities))
+            self._reward_version = version
+
+        return self._expected_reward
+
+    # reward versions are only unique within one process, so a pickled edge
+    # recomputes its expected reward once loaded
+    def __getstate__(self):
+        return [-1 if name == '_reward_version' else getattr(self, name) for name in self.__slots__]
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+    def sample(self) -> str:
+        if self._sampler is None:
+            self._sampler = AliasTable(self.probability)
+
+        return self._sampler.sample()
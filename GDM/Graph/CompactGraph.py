@@ -0,0 +1,25 @@
+from sys import intern
+from typing import List, Set, Tuple
+
+from .CompactEdge import CompactEdge
+from .CompactNode import CompactNode
+from .Graph import Graph
+
+# Memory lean Graph: nodes and edges created through add_default_node and
+# add_default_edge are slotted, and every node name is interned. The rest of
+# the Graph API is unchanged.
+class CompactGraph(Graph):
+    def add_default_node(self, node_name: str, reward: float=1.0, utility: float=0.0,
+                         terminal: bool=False, neighbors: Set[str]=None):
+        if neighbors == None:
+            neighbors = set()
+        else:
+            neighbors = {intern(n) for n in neighbors}
+
+        self.add_node(CompactNode(node_name, reward, utility, terminal, neighbors))
+
+    def add_default_edge(self, src_name: str, tgt_name: str, p: List[Tuple[str, float]]=None):
+        if p == None:
+            p = []
+
+        self.add_edge(CompactEdge(src_name, tgt_name, p))
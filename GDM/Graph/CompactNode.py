@@ -0,0 +1,30 @@
+from dataclasses import dataclass, field
+from sys import intern
+from typing import Set
+
+from .Node import RewardVersion
+
+# Slotted counterpart of Node used by CompactGraph. The name is interned so
+# every neighbor set, probability list, and index entry shares one string.
+@dataclass(slots=True)
+class CompactNode:
+    name: str
+    reward: float
+    utility: float
+    is_terminal: bool
+    neighbors: Set[str]
+    _graph_rewards: RewardVersion = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.name = intern(self.name)
+
+    # slots leave no room for Node's reward descriptor
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name == 'reward':
+            version = getattr(self, '_graph_rewards', None)
+            if version is not None:
+                version.bump()
+
+    def track_rewards(self, version: RewardVersion):
+        self._graph_rewards = version
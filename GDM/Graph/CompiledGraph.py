@@ -0,0 +1,186 @@
+from typing import Dict, List
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+# Integer indexed, CSR style snapshot of a Graph. Node i owns the actions
+# action_offsets[i]:action_offsets[i+1], and action a owns the transitions
+# transition_offsets[a]:transition_offsets[a+1]. Actions are stored in the
+# iteration order of Node.neighbors so ties break the same way they do in
+# utility.create_policy.
+class CompiledGraph:
+    def __init__(self, G):
+        self.names: List[str] = list(G.nodes)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+        action_offsets: List[int] = [0]
+        action_sources: List[int] = []
+        action_targets: List[int] = []
+        transition_offsets: List[int] = [0]
+        transition_targets: List[int] = []
+        transition_probabilities: List[float] = []
+
+        index = self.index
+        for i, node in enumerate(G.nodes.values()):
+            for tgt in node.neighbors:
+                action_sources.append(i)
+                action_targets.append(index[tgt])
+
+                for n_tgt, p in G.edges[(node.name, tgt)].probability:
+                    transition_targets.append(index[n_tgt])
+                    transition_probabilities.append(p)
+
+                transition_offsets.append(len(transition_targets))
+
+            action_offsets.append(len(action_targets))
+
+        self.action_offsets = np.array(action_offsets, dtype=np.int64)
+        self.action_sources = np.array(action_sources, dtype=np.int64)
+        self.action_targets = np.array(action_targets, dtype=np.int64)
+        self.transition_offsets = np.array(transition_offsets, dtype=np.int64)
+        self.transition_targets = np.array(transition_targets, dtype=np.int64)
+        self.transition_probabilities = np.array(transition_probabilities, dtype=np.float64)
+
+        self._transition_matrix: csr_matrix = None
+
+        self.reward = np.zeros(len(self.names), dtype=np.float64)
+        self.utility = np.zeros(len(self.names), dtype=np.float64)
+        self.terminal = np.zeros(len(self.names), dtype=bool)
+        self.refresh(G)
+
+    # Builds a snapshot straight from arrays, e.g. ones memory mapped from a
+    # binary graph file, without going through Node and Edge objects.
+    @classmethod
+    def from_arrays(cls, names: List[str], reward: np.ndarray, utility: np.ndarray,
+                    terminal: np.ndarray, action_offsets: np.ndarray,
+                    action_targets: np.ndarray, transition_offsets: np.ndarray,
+                    transition_targets: np.ndarray,
+                    transition_probabilities: np.ndarray) -> 'CompiledGraph':
+        C = cls.__new__(cls)
+        C.names = names
+        C.index = {name: i for i, name in enumerate(names)}
+        C.reward = reward
+        C.utility = utility
+        C.terminal = terminal
+        C.action_offsets = action_offsets
+        C.action_sources = np.repeat(np.arange(len(names), dtype=np.int64), np.diff(action_offsets))
+        C.action_targets = action_targets
+        C.transition_offsets = transition_offsets
+        C.transition_targets = transition_targets
+        C.transition_probabilities = transition_probabilities
+        C._transition_matrix = None
+        return C
+
+    @property
+    def node_count(self) -> int:
+        return len(self.names)
+
+    @property
+    def action_count(self) -> int:
+        return len(self.action_targets)
+
+    @property
+    def transition_count(self) -> int:
+        return len(self.transition_targets)
+
+    # Sparse (actions x nodes) matrix where row a holds the outcome
+    # distribution of action a.
+    @property
+    def transition_matrix(self) -> csr_matrix:
+        if self._transition_matrix is None:
+            self._transition_matrix = csr_matrix(
+                (self.transition_probabilities, self.transition_targets, self.transition_offsets),
+                shape=(self.action_count, self.node_count)
+            )
+
+        return self._transition_matrix
+
+    ##### Bellman Backups
+    # Vectorized equivalents of utility.calculate_utility,
+    # utility.calculate_max_utility, and utility.create_policy. Terminal nodes
+    # and nodes without neighbors get a utility of 0 and no action (-1).
+    #
+    # utility may also be a (nodes x K) matrix, with gamma and reward
+    # broadcast against it, to back up K problems over the same transitions
+    # at once. The q-values are then (actions x K) and the results of
+    # max_utility and best_actions get one column per problem.
+    def q_values(self, utility: np.ndarray, gamma: float, reward: np.ndarray=None) -> np.ndarray:
+        if reward is None:
+            reward = self.reward
+
+        return self.transition_matrix @ (reward + gamma*utility)
+
+    # q holds the q-values of the actions owned by nodes start:end, which lets
+    # in place solvers back up one block of nodes at a time.
+    def max_utility(self, q: np.ndarray, start: int=0, end: int=None) -> np.ndarray:
+        if end is None:
+            end = self.node_count
+
+        offsets = self.action_offsets[start:end + 1] - self.action_offsets[start]
+        has_actions = offsets[1:] > offsets[:-1]
+
+        u = np.zeros((end - start,) + q.shape[1:], dtype=np.float64)
+        if len(q) > 0:
+            u[has_actions] = np.maximum.reduceat(q, offsets[:-1][has_actions], axis=0)
+
+        u[self.terminal[start:end]] = 0
+        return u
+
+    def best_actions(self, q: np.ndarray) -> np.ndarray:
+        actions = np.full((self.node_count,) + q.shape[1:], -1, dtype=np.int64)
+        has_actions = self.action_offsets[1:] > self.action_offsets[:-1]
+        if self.action_count > 0:
+            starts = self.action_offsets[:-1][has_actions]
+            best_q = np.maximum.reduceat(q, starts, axis=0)
+
+            # first action reaching the max, matching the strict > in create_policy
+            candidates = np.arange(self.action_count, dtype=np.int64).reshape((-1,) + (1,)*(q.ndim - 1))
+            candidates = np.broadcast_to(candidates, q.shape).copy()
+            best_q_per_action = np.repeat(best_q, np.diff(np.append(starts, self.action_count)), axis=0)
+            candidates[q != best_q_per_action] = self.action_count
+            actions[has_actions] = np.minimum.reduceat(candidates, starts, axis=0)
+
+        actions[self.terminal] = -1
+        return actions
+
+    ##### Node Values
+    # Rewards, utilities, and terminal flags can be edited on the Node objects
+    # without changing the structure, so they are re-read on every compile.
+    def refresh(self, G):
+        for i, node in enumerate(G.nodes.values()):
+            self.reward[i] = node.reward
+            self.utility[i] = node.utility
+            self.terminal[i] = node.is_terminal
+
+    ##### Write Back
+    def set_node_utilities(self, G, utility: np.ndarray=None):
+        if utility is None:
+            utility = self.utility
+        else:
+            self.utility[:] = utility
+
+        for name, u in zip(self.names, utility.tolist()):
+            G.nodes[name].utility = u
+
+    # actions holds a global action index per node, or -1 for nodes without a
+    # policy (terminal nodes and nodes without neighbors).
+    def policy(self, actions: np.ndarray) -> Dict[str, str]:
+        names = self.names
+        targets = self.action_targets
+        return {
+            names[i]: names[targets[a]]
+            for i, a in enumerate(actions.tolist())
+            if a >= 0
+        }
+
+    def policy_actions(self, pi: Dict[str, str]) -> np.ndarray:
+        actions = np.full(len(self.names), -1, dtype=np.int64)
+        for name, tgt in pi.items():
+            i = self.index[name]
+            tgt_i = self.index[tgt]
+            start, end = self.action_offsets[i], self.action_offsets[i + 1]
+            a = start + int(np.flatnonzero(self.action_targets[start:end] == tgt_i)[0])
+            actions[i] = a
+
+        return actions
@@ -1,8 +1,47 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Tuple, List
 
+from .AliasTable import AliasTable
+
 @dataclass
 class Edge:
     src: str
     tgt: str
-    probability: List[Tuple[str, float]]
\ No newline at end of file
+    probability: List[Tuple[str, float]]
+    _sampler: AliasTable = field(default=None, init=False, repr=False, compare=False)
+    _expected_reward: float = field(default=0.0, init=False, repr=False, compare=False)
+    _reward_version: int = field(default=-1, init=False, repr=False, compare=False)
+
+    # assigning a new probability list drops the cached alias table and
+    # expected reward; lists edited in place are not seen, use
+    # Graph.set_edge_probability instead
+    def __setattr__(self, name, value):
+        if name == 'probability':
+            object.__setattr__(self, '_sampler', None)
+            object.__setattr__(self, '_reward_version', -1)
+
+        object.__setattr__(self, name, value)
+
+    # reward versions are only unique within one process, so a pickled edge
+    # recomputes its expected reward once loaded
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_reward_version'] = -1
+        return state
+
+    # sum p*R(s') over the outcomes. It only changes with the rewards of G and
+    # the probability list, so it is cached until either is assigned again.
+    def expected_reward(self, G) -> float:
+        version = G.reward_version
+        if self._reward_version != version:
+            nodes = G.nodes
+            self._expected_reward = sum(p * nodes[name].reward for name, p in self.probability)
+            self._reward_version = version
+
+        return self._expected_reward
+
+    def sample(self) -> str:
+        if self._sampler is None:
+            self._sampler = AliasTable(self.probability)
+
+        return self._sampler.sample()
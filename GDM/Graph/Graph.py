@@ -1,13 +1,26 @@
 from typing import Callable, Dict, List, Set, Tuple
 
+from .CompactEdge import CompactEdge
+from .CompactNode import CompactNode
+from .CompiledGraph import CompiledGraph
 from .Edge import Edge
-from .Node import Node
+from .Node import Node, RewardVersion
 
 
 class Graph:
     def __init__(self):
         self.nodes: Dict[str, Node] = {}
         self.edges: Dict[str, Edge] = {}
+        self._compiled: CompiledGraph = None
+
+        # reverse indices kept up to date by add_* and remove_*: the sources of
+        # the edges into a node, and the edges whose probability lists mention
+        # a node
+        self._incoming: Dict[str, Set[str]] = {}
+        self._mentions: Dict[str, Set[Tuple[str, str]]] = {}
+
+        # bumped by the nodes whenever one of their rewards is assigned
+        self._rewards = RewardVersion()
 
     ##### Node Operations
     def get_node(self, node_name: str) -> Node:
@@ -17,9 +30,14 @@ class Graph:
         return node_name in self.nodes
 
     def add_node(self, node: Node):
-        assert isinstance(node, Node)
+        assert isinstance(node, (Node, CompactNode))
         assert node.name not in self.nodes
         self.nodes[node.name] = node
+        node.track_rewards(self._rewards)
+        self._rewards.bump()
+        self._incoming[node.name] = set()
+        self._mentions.setdefault(node.name, set())
+        self._compiled = None
 
     def add_default_node(self, node_name: str, reward: float=1.0, utility: float=0.0,
                          terminal: bool=False, neighbors: Set[str]=None):
@@ -28,39 +46,39 @@ class Graph:
         if neighbors == None:
             neighbors = set()
 
-        self.nodes[node_name] = Node(node_name, reward, utility, terminal, neighbors)
+        self.add_node(Node(node_name, reward, utility, terminal, neighbors))
 
     def remove_node(self, node_name: str):
         assert node_name in self.nodes
 
-        edges_to_remove: List[Edge] = []
-        for e in self.edges.values():
-            # add to list to remove from edges
-            if e.src == node_name or e.tgt == node_name:
-                edges_to_remove.append(e)
-
-            # check if node occurs in the probabilities array
-            probabilities = e.probability
-            index = -1
-            for i, (name, _) in enumerate(probabilities):
-                if name == node_name:
-                    index = i
-                    break
-
-            if index == -1:
+        # a self-loop is both incoming and outgoing, so it is taken from the
+        # neighbors only
+        edges_to_remove: List[Tuple[str, str]] = [
+            (src, node_name) for src in self._incoming[node_name] if src != node_name
+        ]
+        edges_to_remove.extend((node_name, tgt) for tgt in self.neighbors(node_name))
+
+        for key in self._mentions[node_name]:
+            if key[0] == node_name or key[1] == node_name:
                 continue
 
-            # if it is in the array remove it and spread the probability to the
-            # other values in the probabilities array
-            p_value = probabilities[index][1]
-            probabilities.pop(index)
-            p_value /= len(probabilities)
+            # remove the node from the probabilities array and spread its
+            # probability to the other values in the array
+            e = self.edges[key]
+            p_value = sum(p for name, p in e.probability if name == node_name)
+            probabilities = [(name, p) for name, p in e.probability if name != node_name]
+            if len(probabilities) > 0:
+                p_value /= len(probabilities)
+
             e.probability = [(name, p + p_value) for name, p in probabilities]
 
-        for e in edges_to_remove:
-            self.remove_edge(e.src, e.tgt)
+        for src, tgt in edges_to_remove:
+            self.remove_edge(src, tgt)
 
         del self.nodes[node_name]
+        del self._incoming[node_name]
+        del self._mentions[node_name]
+        self._compiled = None
 
     ##### Edge Operations
     def get_edge(self, src_name: str, tgt_name: str) -> Edge:
@@ -70,11 +88,17 @@ class Graph:
         return (src_name, tgt_name) in self.edges
 
     def add_edge(self, edge: Edge):
-        assert isinstance(edge, Edge)
+        assert isinstance(edge, (Edge, CompactEdge))
         assert edge.src in self.nodes
         assert edge.tgt in self.nodes
         assert (edge.src, edge.tgt) not in self.edges
-        self.edges[(edge.src, edge.tgt)] = edge
+        key = (edge.src, edge.tgt)
+        self.edges[key] = edge
+        self._incoming[edge.tgt].add(edge.src)
+        for name, _ in edge.probability:
+            self._mentions.setdefault(name, set()).add(key)
+
+        self._compiled = None
 
         neighbors = self.nodes[edge.src].neighbors
         if edge.tgt not in neighbors:
@@ -91,20 +115,56 @@ class Graph:
         assert tgt_node in self.nodes
         assert (src_node, tgt_node) in self.edges
 
+        key = (src_node, tgt_node)
+        for name, _ in self.edges[key].probability:
+            self._mentions[name].discard(key)
+
         self.neighbors(src_node).remove(tgt_node)
-        del self.edges[(src_node, tgt_node)]
+        self._incoming[tgt_node].remove(src_node)
+        del self.edges[key]
+        self._compiled = None
+
+    # Probability lists should be replaced through here rather than edited in
+    # place so the reverse indices and the compiled graph stay consistent.
+    def set_edge_probability(self, src_name: str, tgt_name: str, p: List[Tuple[str, float]]):
+        key = (src_name, tgt_name)
+        e = self.edges[key]
+        for name, _ in e.probability:
+            self._mentions[name].discard(key)
+
+        e.probability = p
+        for name, _ in p:
+            self._mentions.setdefault(name, set()).add(key)
+
+        self._compiled = None
+
+    ##### Compilation
+    # The structure is cached until the graph is mutated through add_* or
+    # remove_*. Node values (reward, utility, terminal) are re-read on every
+    # call since they are often edited directly on the Node. Edge probability
+    # lists edited in place are not tracked; use set_edge_probability instead.
+    def compile(self) -> CompiledGraph:
+        if self._compiled is None:
+            self._compiled = CompiledGraph(self)
+        else:
+            self._compiled.refresh(self)
+
+        return self._compiled
+
+    def invalidate(self):
+        self._compiled = None
 
     ##### Useful Functions
-    # WARNING: inefficient implementation, could be a lot smarter. Don't use if
-    # you need something to run quickly
     def incoming_edges(self, node_name: str) -> List[Edge]:
-        edges = []
-        for n in self.nodes:
-            key = (n, node_name)
-            if key in self.edges:
-                edges.append(self.edges[key])
+        return [self.edges[(src, node_name)] for src in self._incoming[node_name]]
 
-        return edges
+    # Nodes with an edge whose probability list mentions node_name, i.e. the
+    # nodes whose utility depends on the utility of node_name.
+    def predecessors(self, node_name: str) -> Set[str]:
+        return {src for src, _ in self._mentions.get(node_name, ())}
+
+    def mentioning_edges(self, node_name: str) -> List[Edge]:
+        return [self.edges[key] for key in self._mentions.get(node_name, ())]
 
     def neighbors(self, node_name: str) -> Set[str]:
         return self.nodes[node_name].neighbors
@@ -119,6 +179,11 @@ class Graph:
     def reward(self, node_name: str) -> float:
         return self.nodes[node_name].reward
 
+    # changes whenever the reward of a node is assigned, see Edge.expected_reward
+    @property
+    def reward_version(self) -> int:
+        return self._rewards.value
+
     def is_terminal(self, node_name: str) -> bool:
         return self.nodes[node_name].is_terminal
 
@@ -1,10 +1,47 @@
 from dataclasses import dataclass
+from itertools import count
 from typing import Set
 
+# Version numbers are unique across graphs, so an edge moved to another graph
+# cannot mistake that graph's rewards for the ones it cached.
+_versions = count(1)
+
+# Shared by a graph and its nodes, and bumped whenever the reward of one of
+# the nodes is assigned, so values cached from rewards (see
+# Edge.expected_reward) can tell they are stale.
+class RewardVersion:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.bump()
+
+    def bump(self):
+        self.value = next(_versions)
+
+# Stores the reward in the instance dict like a plain attribute, but assigning
+# it bumps the RewardVersion of the node's graph. Other attributes, like the
+# utility written by every backup, are left as fast as before.
+class _Reward:
+    def __get__(self, obj, objtype=None) -> float:
+        if obj is None:
+            raise AttributeError('reward has no default')
+
+        return obj.__dict__['reward']
+
+    def __set__(self, obj, value: float):
+        obj.__dict__['reward'] = value
+        version = obj.__dict__.get('_graph_rewards')
+        if version is not None:
+            version.bump()
+
 @dataclass
 class Node:
     name: str
-    reward: float
+    reward: float = _Reward()
     utility: float
     is_terminal: bool
-    neighbors: Set[str]
\ No newline at end of file
+    neighbors: Set[str]
+
+    # called by Graph.add_node; a node reports to the graph it was last added to
+    def track_rewards(self, version: RewardVersion):
+        self._graph_rewards = version
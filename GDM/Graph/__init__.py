@@ -1,3 +1,7 @@
 from .Graph import Graph
+from .CompactGraph import CompactGraph
+from .CompiledGraph import CompiledGraph
 from .Node import Node
-from .Edge import Edge
\ No newline at end of file
+from .Edge import Edge
+from .CompactNode import CompactNode
+from .CompactEdge import CompactEdge
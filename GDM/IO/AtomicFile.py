@@ -0,0 +1,36 @@
+import os
+import shutil
+from contextlib import contextmanager
+from tempfile import NamedTemporaryFile
+
+# The temporary file is created 0600; give it the mode of the file it replaces,
+# or the default mode of a new file.
+def __copy_mode(path: str, temp_path: str):
+    if os.path.exists(path):
+        shutil.copymode(path, temp_path)
+    else:
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_path, 0o666 & ~umask)
+
+# Writes into a temporary file next to path and renames it over path once the
+# block finishes, so a crash mid write leaves the previous file intact. The
+# file keeps its permissions, and a symlink keeps pointing at the rewritten
+# file.
+@contextmanager
+def atomic_write(path: str, mode: str='w'):
+    path = os.path.realpath(path)
+    directory = os.path.dirname(path)
+    name = os.path.basename(path)
+    with NamedTemporaryFile(mode, dir=directory, prefix=f'.{name}-', suffix='.tmp', delete=False) as f:
+        try:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+            __copy_mode(path, f.name)
+        except BaseException:
+            f.close()
+            os.remove(f.name)
+            raise
+
+    os.replace(f.name, path)
@@ -0,0 +1,150 @@
+import mmap
+import struct
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from ..Graph import CompiledGraph
+from .AtomicFile import atomic_write
+from .GraphJSON import load_graph_json, write_graph_json
+
+# Little endian layout:
+#
+#   header    magic, version, flags, nodes, actions, transitions, name bytes, scale
+#   sections  the arrays below in order, each padded to 8 bytes
+#
+# The node, action, and transition arrays are the ones of CompiledGraph, so
+# the reader can hand memory mapped views straight to the solvers.
+MAGIC = b'GDMB'
+VERSION = 1
+HEADER = struct.Struct('<4sIIqqqqd')
+ALIGNMENT = 8
+
+FLAG_POSITIONS = 1
+
+def __sections(nodes: int, actions: int, transitions: int, name_bytes: int,
+               flags: int) -> List[Tuple[str, np.dtype, int]]:
+    sections = [
+        ('reward', np.dtype('<f8'), nodes),
+        ('utility', np.dtype('<f8'), nodes),
+        ('terminal', np.dtype(np.bool_), nodes),
+        ('action_offsets', np.dtype('<i8'), nodes + 1),
+        ('action_targets', np.dtype('<i8'), actions),
+        ('transition_offsets', np.dtype('<i8'), actions + 1),
+        ('transition_targets', np.dtype('<i8'), transitions),
+        ('transition_probabilities', np.dtype('<f8'), transitions),
+        ('name_offsets', np.dtype('<i8'), nodes + 1),
+        ('names', np.dtype(np.uint8), name_bytes),
+    ]
+
+    if flags & FLAG_POSITIONS:
+        sections.append(('x', np.dtype('<f8'), nodes))
+        sections.append(('y', np.dtype('<f8'), nodes))
+
+    return sections
+
+def __padding(size: int) -> int:
+    return -size % ALIGNMENT
+
+# positions optionally stores the editor position of every node so a
+# graph.json survives the trip through the binary format.
+def write_graph_binary(path: str, C: CompiledGraph, scale: float=1.0,
+                       positions: Dict[str, Tuple[float, float]]=None):
+    encoded = [name.encode() for name in C.names]
+    name_offsets = np.zeros(C.node_count + 1, dtype=np.int64)
+    np.cumsum([len(name) for name in encoded], out=name_offsets[1:])
+
+    arrays = {
+        'reward': C.reward,
+        'utility': C.utility,
+        'terminal': C.terminal,
+        'action_offsets': C.action_offsets,
+        'action_targets': C.action_targets,
+        'transition_offsets': C.transition_offsets,
+        'transition_targets': C.transition_targets,
+        'transition_probabilities': C.transition_probabilities,
+        'name_offsets': name_offsets,
+        'names': np.frombuffer(b''.join(encoded), dtype=np.uint8),
+    }
+
+    flags = 0
+    if positions is not None:
+        flags |= FLAG_POSITIONS
+        arrays['x'] = np.array([positions[name][0] for name in C.names], dtype=np.float64)
+        arrays['y'] = np.array([positions[name][1] for name in C.names], dtype=np.float64)
+
+    with atomic_write(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, C.node_count, C.action_count,
+                            C.transition_count, int(name_offsets[-1]), scale))
+        f.write(bytes(__padding(HEADER.size)))
+
+        for key, dtype, count in __sections(C.node_count, C.action_count, C.transition_count,
+                                            int(name_offsets[-1]), flags):
+            data = np.ascontiguousarray(arrays[key], dtype=dtype)
+            assert len(data) == count
+            f.write(data.tobytes())
+            f.write(bytes(__padding(data.nbytes)))
+
+# Memory maps the file copy on write: the arrays are views of the page cache,
+# and solvers can still write utilities without touching the file. Returns
+# the graph and the metadata (scale, plus x and y arrays if stored).
+def read_graph_binary(path: str) -> Tuple[CompiledGraph, Dict[str, Any]]:
+    with open(path, 'rb') as f:
+        m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    magic, version, flags, nodes, actions, transitions, name_bytes, scale = HEADER.unpack_from(m, 0)
+    assert magic == MAGIC, f'{path} is not a binary graph file'
+    assert version == VERSION, f'unsupported binary graph version {version}'
+
+    arrays: Dict[str, np.ndarray] = {}
+    offset = HEADER.size + __padding(HEADER.size)
+    for key, dtype, count in __sections(nodes, actions, transitions, name_bytes, flags):
+        arrays[key] = np.frombuffer(m, dtype=dtype, count=count, offset=offset)
+        offset += count*dtype.itemsize + __padding(count*dtype.itemsize)
+
+    names_blob = arrays['names'].tobytes()
+    name_offsets = arrays['name_offsets'].tolist()
+    names = [names_blob[name_offsets[i]:name_offsets[i + 1]].decode() for i in range(nodes)]
+
+    C = CompiledGraph.from_arrays(
+        names,
+        arrays['reward'],
+        arrays['utility'],
+        arrays['terminal'],
+        arrays['action_offsets'],
+        arrays['action_targets'],
+        arrays['transition_offsets'],
+        arrays['transition_targets'],
+        arrays['transition_probabilities']
+    )
+
+    metadata: Dict[str, Any] = {'scale': scale}
+    if flags & FLAG_POSITIONS:
+        metadata['x'] = arrays['x']
+        metadata['y'] = arrays['y']
+
+    return C, metadata
+
+##### Conversion
+def json_to_binary(json_path: str, binary_path: str):
+    G, metadata, positions = load_graph_json(json_path)
+    write_graph_binary(binary_path, G.compile(), metadata.get('scale', 1.0), positions)
+
+# Edges become the node's neighbors; since graph.json has no outcome
+# distributions, only graphs with deterministic edges convert back losslessly.
+def binary_to_json(binary_path: str, json_path: str):
+    C, metadata = read_graph_binary(binary_path)
+    x = metadata.get('x', np.zeros(C.node_count))
+    y = metadata.get('y', np.zeros(C.node_count))
+
+    def nodes():
+        for i, name in enumerate(C.names):
+            start, end = C.action_offsets[i], C.action_offsets[i + 1]
+            yield name, {
+                'x': float(x[i]),
+                'y': float(y[i]),
+                'reward': float(C.reward[i]),
+                'neighbors': [C.names[t] for t in C.action_targets[start:end].tolist()]
+            }
+
+    write_graph_json(json_path, {'scale': metadata['scale']}, nodes())
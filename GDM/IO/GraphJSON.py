@@ -0,0 +1,147 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+from ..Graph import Graph
+from .AtomicFile import atomic_write
+
+WHITESPACE = ' \t\n\r'
+
+# Streams the editor's graph.json,
+#
+#   {"scale": 1.0, "graph": {"<node>": {"x": .., "y": .., "reward": ..,
+#                                      "neighbors": [..], "depth": ..}, ...}}
+#
+# one node at a time, so the whole document is never held in memory. Top level
+# keys other than "graph" are collected in metadata as they are passed; the
+# editor's saver writes them before "graph".
+class GraphJSONReader:
+    def __init__(self, path: str, chunk_size: int=1 << 16):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.metadata: Dict[str, Any] = {}
+
+        self.__decoder = json.JSONDecoder()
+        self.__file = None
+        self.__buffer = ''
+        self.__pos = 0
+        self.__eof = False
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        with open(self.path) as self.__file:
+            self.__buffer = ''
+            self.__pos = 0
+            self.__eof = False
+
+            self.__expect('{')
+            for key in self.__keys():
+                if key != 'graph':
+                    self.metadata[key] = self.__value()
+                    continue
+
+                self.__expect('{')
+                for node_name in self.__keys():
+                    yield node_name, self.__value()
+
+    ##### Tokenizing
+    def __fill(self) -> bool:
+        chunk = self.__file.read(self.chunk_size)
+        self.__buffer = self.__buffer[self.__pos:] + chunk
+        self.__pos = 0
+        self.__eof = len(chunk) == 0
+        return not self.__eof
+
+    def __peek(self) -> str:
+        while True:
+            while self.__pos < len(self.__buffer) and self.__buffer[self.__pos] in WHITESPACE:
+                self.__pos += 1
+
+            if self.__pos < len(self.__buffer):
+                return self.__buffer[self.__pos]
+
+            if not self.__fill():
+                raise json.JSONDecodeError('unexpected end of file', self.__buffer, self.__pos)
+
+    def __expect(self, c: str):
+        if self.__peek() != c:
+            raise json.JSONDecodeError(f'expected {c!r}', self.__buffer, self.__pos)
+
+        self.__pos += 1
+
+    # A value cut off by the end of the buffer can still decode, e.g. "0.75"
+    # read as far as "0." decodes to 0, so a value is only accepted once the
+    # delimiter after it is in the buffer.
+    def __value(self) -> Any:
+        self.__peek()
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buffer, self.__pos)
+                delimiter = end
+                while delimiter < len(self.__buffer) and self.__buffer[delimiter] in WHITESPACE:
+                    delimiter += 1
+
+                if self.__eof or (delimiter < len(self.__buffer) and self.__buffer[delimiter] in ',:}]'):
+                    self.__pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.__eof:
+                    raise
+
+            self.__fill()
+
+    # Yields the keys of the object whose '{' was just consumed; the caller
+    # consumes each value.
+    def __keys(self) -> Iterator[str]:
+        if self.__peek() == '}':
+            self.__pos += 1
+            return
+
+        while True:
+            key = self.__value()
+            self.__expect(':')
+            yield key
+
+            if self.__peek() == ',':
+                self.__pos += 1
+            else:
+                self.__expect('}')
+                return
+
+# Writes graph.json one node per line, atomically.
+def write_graph_json(path: str, metadata: Dict[str, Any], nodes: Iterable[Tuple[str, Dict[str, Any]]]):
+    with atomic_write(path) as f:
+        f.write('{\n')
+        for key, value in metadata.items():
+            f.write(f'{json.dumps(key)}: {json.dumps(value)},\n')
+
+        f.write('"graph": {')
+        separator = '\n'
+        for node_name, node_values in nodes:
+            f.write(f'{separator}{json.dumps(node_name)}: {json.dumps(node_values)}')
+            separator = ',\n'
+
+        f.write('\n}\n}\n')
+
+# Headless load of a graph.json into a Graph for the solvers. The editor does
+# not store outcome distributions, so every edge is deterministic, and nodes
+# without neighbors are terminal. Also returns the top level metadata (scale)
+# and the editor position of every node.
+def load_graph_json(path: str, graph_type: type=Graph) -> Tuple[Graph, Dict[str, Any], Dict[str, Tuple[float, float]]]:
+    G = graph_type()
+    reader = GraphJSONReader(path)
+    positions: Dict[str, Tuple[float, float]] = {}
+    neighbors: Dict[str, list] = {}
+
+    for node_name, node_values in reader:
+        positions[node_name] = (node_values.get('x', 0), node_values.get('y', 0))
+        neighbors[node_name] = node_values['neighbors']
+        G.add_default_node(node_name, reward=node_values['reward'],
+                           terminal=len(node_values['neighbors']) == 0)
+
+    for node_name, node_neighbors in neighbors.items():
+        for tgt in node_neighbors:
+            G.add_default_edge(node_name, tgt, [(tgt, 1.0)])
+
+    return G, reader.metadata, positions
+
+def read_graph_json(path: str, graph_type: type=Graph) -> Graph:
+    return load_graph_json(path, graph_type)[0]
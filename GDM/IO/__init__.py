@@ -0,0 +1,2 @@
+from .GraphJSON import GraphJSONReader, load_graph_json, read_graph_json, write_graph_json
+from .GraphBinary import read_graph_binary, write_graph_binary, json_to_binary, binary_to_json
@@ -0,0 +1,160 @@
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from ..Graph import Graph
+from .LayeredLayout import layered_layout
+
+# points closer than this share a quadtree leaf
+MAX_DEPTH = 24
+
+# (center_x, center_y, half_size, mass, mass_x, mass_y, child_start, child_count)
+QuadTree = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray,
+                 np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+# Builds the quadtree one level at a time: every point that is not alone in
+# its cell moves to the quadrant of the cell it falls in. Cells are numbered
+# level by level, and the children of a cell are contiguous.
+def __quadtree(x: np.ndarray, y: np.ndarray) -> QuadTree:
+    half = max(x.max() - x.min(), y.max() - y.min()) / 2 + 1
+    center_x = np.array([(x.max() + x.min()) / 2])
+    center_y = np.array([(y.max() + y.min()) / 2])
+
+    points = np.arange(len(x))
+    cell = np.zeros(len(x), dtype=np.int64)
+    offset = 0
+
+    levels: List[List[np.ndarray]] = []
+    for depth in range(MAX_DEPTH + 1):
+        cells = len(center_x)
+        mass = np.bincount(cell, minlength=cells).astype(np.float64)
+        mass_x = np.bincount(cell, weights=x[points], minlength=cells) / mass
+        mass_y = np.bincount(cell, weights=y[points], minlength=cells) / mass
+
+        child_start = np.zeros(cells, dtype=np.int64)
+        child_count = np.zeros(cells, dtype=np.int64)
+        levels.append([center_x, center_y, np.full(cells, half), mass, mass_x, mass_y,
+                       child_start, child_count])
+
+        split = mass > 1
+        if depth == MAX_DEPTH or not split.any():
+            break
+
+        keep = split[cell]
+        points = points[keep]
+        cell = cell[keep]
+
+        quadrant = (x[points] > center_x[cell]).astype(np.int64) + 2*(y[points] > center_y[cell])
+        children, cell = np.unique(cell*4 + quadrant, return_inverse=True)
+        parent = children // 4
+
+        child_start[:] = offset + cells + np.searchsorted(parent, np.arange(cells))
+        child_count[:] = np.bincount(parent, minlength=cells)
+
+        half /= 2
+        center_x = center_x[parent] + np.where(children & 1, half, -half)
+        center_y = center_y[parent] + np.where(children & 2, half, -half)
+        offset += cells
+
+    return tuple(np.concatenate(arrays) for arrays in zip(*levels))
+
+# Repulsion of every point from every other, k^2/d, with the Barnes-Hut
+# approximation: a cell that looks small from a point (size/d < theta) and
+# does not contain it acts as one body at its center of mass. All points walk
+# the tree together; each round handles every (point, cell) pair at once.
+def __repulsion(x: np.ndarray, y: np.ndarray, tree: QuadTree, theta: float,
+                k: float) -> Tuple[np.ndarray, np.ndarray]:
+    center_x, center_y, half, mass, mass_x, mass_y, child_start, child_count = tree
+    n = len(x)
+    force_x = np.zeros(n)
+    force_y = np.zeros(n)
+
+    point = np.arange(n)
+    cell = np.zeros(n, dtype=np.int64)
+    while len(point) > 0:
+        dx = x[point] - mass_x[cell]
+        dy = y[point] - mass_y[cell]
+        d2 = dx*dx + dy*dy
+
+        inside = (np.abs(x[point] - center_x[cell]) <= half[cell]) & \
+                 (np.abs(y[point] - center_y[cell]) <= half[cell])
+        far = 4*half[cell]*half[cell] < theta*theta*d2
+        accept = (child_count[cell] == 0) | (far & ~inside)
+
+        # a leaf holding the point itself is at distance 0 and skipped
+        apply = accept & (d2 > 1e-9)
+        scale = k*k*mass[cell[apply]] / d2[apply]
+        force_x += np.bincount(point[apply], weights=dx[apply]*scale, minlength=n)
+        force_y += np.bincount(point[apply], weights=dy[apply]*scale, minlength=n)
+
+        point = point[~accept]
+        cell = cell[~accept]
+        counts = child_count[cell]
+        within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        point = np.repeat(point, counts)
+        cell = np.repeat(child_start[cell], counts) + within
+
+    return force_x, force_y
+
+# Fruchterman-Reingold refinement of positions: edges pull their ends
+# together with d^2/k, all nodes push each other apart with k^2/d, and every
+# step is capped by a temperature that cools to zero. Repulsion uses a
+# Barnes-Hut quadtree, so an iteration is O(n log n). Edges are treated as
+# undirected. With move_x False only y changes, keeping the columns of
+# layered_layout. callback is given the iteration and positions every
+# callback_every iterations; should_stop ends the refinement early.
+def force_directed_layout(G: Graph, positions: Dict[str, Tuple[float, float]]=None,
+                          iterations: int=50, spacing: float=90.0, theta: float=0.8,
+                          move_x: bool=True, seed: int=0,
+                          callback: Callable[[int, Dict[str, Tuple[float, float]]], None]=None,
+                          callback_every: int=5,
+                          should_stop: Callable[[], bool]=None) -> Dict[str, Tuple[float, float]]:
+    if positions is None:
+        positions = layered_layout(G, node_spacing=spacing)
+
+    names = list(G.nodes)
+    if len(names) == 0:
+        return {}
+
+    index = {name: i for i, name in enumerate(names)}
+    x = np.array([positions[name][0] for name in names], dtype=np.float64)
+    y = np.array([positions[name][1] for name in names], dtype=np.float64)
+
+    # separate coincident nodes
+    rng = np.random.default_rng(seed)
+    if move_x:
+        x += rng.uniform(-1e-3, 1e-3, len(x))
+    y += rng.uniform(-1e-3, 1e-3, len(y))
+
+    pairs = {(min(index[s], index[t]), max(index[s], index[t])) for s, t in G.edges if s != t}
+    src = np.array([s for s, _ in pairs], dtype=np.int64)
+    tgt = np.array([t for _, t in pairs], dtype=np.int64)
+
+    def to_dict() -> Dict[str, Tuple[float, float]]:
+        return dict(zip(names, zip(x.tolist(), y.tolist())))
+
+    for iteration in range(iterations):
+        if should_stop is not None and should_stop():
+            break
+
+        force_x, force_y = __repulsion(x, y, __quadtree(x, y), theta, spacing)
+
+        dx = x[tgt] - x[src]
+        dy = y[tgt] - y[src]
+        pull = np.sqrt(dx*dx + dy*dy) / spacing
+        force_x += np.bincount(src, weights=dx*pull, minlength=len(x)) - np.bincount(tgt, weights=dx*pull, minlength=len(x))
+        force_y += np.bincount(src, weights=dy*pull, minlength=len(y)) - np.bincount(tgt, weights=dy*pull, minlength=len(y))
+
+        if not move_x:
+            force_x[:] = 0
+
+        temperature = spacing * (1 - iteration / iterations)
+        length = np.maximum(np.sqrt(force_x*force_x + force_y*force_y), 1e-9)
+        step = np.minimum(length, temperature) / length
+        x += force_x * step
+        y += force_y * step
+
+        if callback is not None and (iteration + 1) % callback_every == 0:
+            callback(iteration, to_dict())
+
+    return to_dict()
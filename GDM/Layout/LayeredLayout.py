@@ -0,0 +1,152 @@
+from collections import deque
+from math import ceil, sqrt
+from typing import Dict, List, Set, Tuple
+
+from ..Graph import Graph
+
+# Undirected adjacency; the layout only cares which nodes are connected.
+def __adjacency(G: Graph) -> Dict[str, Set[str]]:
+    adjacent: Dict[str, Set[str]] = {name: set() for name in G.nodes}
+    for src, tgt in G.edges:
+        if src != tgt:
+            adjacent[src].add(tgt)
+            adjacent[tgt].add(src)
+
+    return adjacent
+
+# Breadth first depth from start. Nodes start cannot reach are laid out from
+# the unreached nodes without incoming edges, then from any unreached node, so
+# every connected node gets a layer.
+def __layers(G: Graph, start: str, adjacent: Dict[str, Set[str]]) -> List[List[str]]:
+    depth: Dict[str, int] = {}
+    layers: List[List[str]] = []
+
+    def bfs(root: str):
+        depth[root] = 0
+        queue = deque([root])
+        while len(queue) > 0:
+            name = queue.popleft()
+            d = depth[name]
+            if d == len(layers):
+                layers.append([])
+
+            layers[d].append(name)
+            for neighbor in G.neighbors(name):
+                if neighbor not in depth:
+                    depth[neighbor] = d + 1
+                    queue.append(neighbor)
+
+    if start in G.nodes:
+        bfs(start)
+
+    has_incoming = {tgt for _, tgt in G.edges}
+    roots = [name for name in G.nodes if name not in has_incoming]
+    roots.extend(G.nodes)
+    for name in roots:
+        if name not in depth and len(adjacent[name]) > 0:
+            bfs(name)
+
+    return layers
+
+# Number of crossing edges between two neighboring layers: with the edges
+# sorted by their position in the upper layer, every inversion of their
+# position in the lower layer is a crossing. Counted with a Fenwick tree.
+def __crossings(upper: List[str], lower: List[str], adjacent: Dict[str, Set[str]],
+                position: Dict[str, int]) -> int:
+    lower_set = set(lower)
+    pairs = sorted(
+        (position[u], position[v])
+        for u in upper
+        for v in adjacent[u]
+        if v in lower_set
+    )
+
+    tree = [0] * (len(lower) + 1)
+    crossings = 0
+    for seen, (_, p) in enumerate(pairs):
+        # edges already seen that end to the right of p
+        i = p + 1
+        not_right = 0
+        while i > 0:
+            not_right += tree[i]
+            i -= i & -i
+
+        crossings += seen - not_right
+
+        i = p + 1
+        while i <= len(lower):
+            tree[i] += 1
+            i += i & -i
+
+    return crossings
+
+def __total_crossings(layers: List[List[str]], adjacent: Dict[str, Set[str]],
+                      position: Dict[str, int]) -> int:
+    return sum(
+        __crossings(layers[d], layers[d + 1], adjacent, position)
+        for d in range(len(layers) - 1)
+    )
+
+# Reorders layer by the mean position of every node's neighbors in the fixed
+# layer. Nodes without such neighbors keep their position.
+def __barycenter_sort(layer: List[str], fixed: List[str], adjacent: Dict[str, Set[str]],
+                      position: Dict[str, int]):
+    fixed_set = set(fixed)
+
+    def key(name: str) -> float:
+        positions = [position[n] for n in adjacent[name] if n in fixed_set]
+        if len(positions) == 0:
+            return position[name]
+
+        return sum(positions) / len(positions)
+
+    layer.sort(key=key)
+    for i, name in enumerate(layer):
+        position[name] = i
+
+# Places nodes in columns by their breadth first depth from start and orders
+# every column with the barycenter heuristic, alternating downward and upward
+# sweeps and keeping the order with the fewest edge crossings. Nodes without
+# any edges are put in a square grid below the columns.
+def layered_layout(G: Graph, start: str='start', layer_spacing: float=150.0,
+                   node_spacing: float=90.0, sweeps: int=8) -> Dict[str, Tuple[float, float]]:
+    adjacent = __adjacency(G)
+    layers = __layers(G, start, adjacent)
+
+    position: Dict[str, int] = {}
+    for layer in layers:
+        for i, name in enumerate(layer):
+            position[name] = i
+
+    best = [list(layer) for layer in layers]
+    best_crossings = __total_crossings(layers, adjacent, position)
+
+    for sweep in range(sweeps):
+        if best_crossings == 0:
+            break
+
+        if sweep % 2 == 0:
+            for d in range(1, len(layers)):
+                __barycenter_sort(layers[d], layers[d - 1], adjacent, position)
+        else:
+            for d in range(len(layers) - 2, -1, -1):
+                __barycenter_sort(layers[d], layers[d + 1], adjacent, position)
+
+        crossings = __total_crossings(layers, adjacent, position)
+        if crossings < best_crossings:
+            best = [list(layer) for layer in layers]
+            best_crossings = crossings
+
+    positions: Dict[str, Tuple[float, float]] = {}
+    for d, layer in enumerate(best):
+        for i, name in enumerate(layer):
+            positions[name] = (d * layer_spacing, i * node_spacing)
+
+    isolated = [name for name in G.nodes if name not in positions]
+    if len(isolated) > 0:
+        columns = ceil(sqrt(len(isolated)))
+        top = (max((len(layer) for layer in best), default=0) + 1) * node_spacing
+        for i, name in enumerate(isolated):
+            positions[name] = ((i % columns) * node_spacing, top + (i // columns) * node_spacing)
+
+    return positions
@@ -0,0 +1,66 @@
+from queue import Empty, Queue
+from threading import Event, Thread
+from typing import Dict, Optional, Tuple
+
+from ..Graph import Graph
+from .ForceLayout import force_directed_layout
+from .LayeredLayout import layered_layout
+
+# Runs layered_layout and then force_directed_layout on a background thread.
+# The layered positions and every intermediate refinement are put on a queue
+# for the owner to draw; None marks the end. G must not be changed while the
+# worker runs, so give it a copy of a graph that is being edited.
+class LayoutWorker:
+    def __init__(self, G: Graph, start: str='start', iterations: int=50,
+                 spacing: float=90.0, move_x: bool=False, stream_every: int=5):
+        self.positions: Queue = Queue()
+        self.__stop = Event()
+        self.__thread = Thread(
+            target=self.__run,
+            args=(G, start, iterations, spacing, move_x, stream_every),
+            name='layout',
+            daemon=True
+        )
+
+    def start(self):
+        self.__thread.start()
+
+    def stop(self):
+        self.__stop.set()
+
+    def is_alive(self) -> bool:
+        return self.__thread.is_alive()
+
+    # Latest positions put on the queue since the last call, skipping any that
+    # were superseded. Returns (positions, done).
+    def latest(self) -> Tuple[Optional[Dict[str, Tuple[float, float]]], bool]:
+        positions = None
+        while True:
+            try:
+                item = self.positions.get_nowait()
+            except Empty:
+                return positions, False
+
+            if item is None:
+                return positions, True
+
+            positions = item
+
+    def __run(self, G: Graph, start: str, iterations: int, spacing: float,
+              move_x: bool, stream_every: int):
+        try:
+            positions = layered_layout(G, start, node_spacing=spacing)
+            self.positions.put(positions)
+
+            self.positions.put(force_directed_layout(
+                G,
+                positions,
+                iterations=iterations,
+                spacing=spacing,
+                move_x=move_x,
+                callback=lambda _iteration, p: self.positions.put(p),
+                callback_every=stream_every,
+                should_stop=self.__stop.is_set
+            ))
+        finally:
+            self.positions.put(None)
@@ -0,0 +1,3 @@
+from .ForceLayout import force_directed_layout
+from .LayeredLayout import layered_layout
+from .LayoutWorker import LayoutWorker
@@ -0,0 +1,116 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from ..Graph import Graph, CompiledGraph
+from .RolloutStats import RolloutStats
+
+# (keys, outcomes, node_segment, reward, terminal, stops)
+SamplingTable = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+# Flattens the outcome distribution of the action pi picks at every node into
+# one sorted array of keys, segment + cumulative probability, so the next
+# state of every walker is found with a single searchsorted. Like Edge.sample,
+# every distribution pi uses must sum to 1; round off left over is given to
+# the intended target.
+def __sampling_table(C: CompiledGraph, pi: Dict[str, str]) -> SamplingTable:
+    actions = C.policy_actions(pi)
+    nodes = np.flatnonzero(actions >= 0)
+    a = actions[nodes]
+    segments = len(nodes)
+
+    starts = C.transition_offsets[a]
+    lengths = C.transition_offsets[a + 1] - starts
+    seg = np.repeat(np.arange(segments), lengths)
+    within = np.arange(len(seg)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    transitions = starts[seg] + within
+
+    probabilities = C.transition_probabilities[transitions]
+    residual = 1 - np.bincount(seg, weights=probabilities, minlength=segments)
+    invalid = np.flatnonzero(np.abs(residual) > 1e-9)
+    assert len(invalid) == 0, \
+        f'probabilities of edge {C.names[nodes[invalid[0]]]} -> {C.names[C.action_targets[a[invalid[0]]]]} do not sum to 1'
+
+    all_seg = np.concatenate((seg, np.arange(segments)))
+    order = np.lexsort((np.concatenate((within, lengths)), all_seg))
+    all_seg = all_seg[order]
+    p = np.concatenate((probabilities, np.maximum(residual, 0)))[order]
+    outcomes = np.concatenate((C.transition_targets[transitions], C.action_targets[a]))[order]
+
+    cumulative = np.cumsum(p)
+    segment_ends = np.cumsum(lengths + 1)
+    base = np.concatenate(([0.0], cumulative[segment_ends[:-1] - 1]))
+    keys = all_seg + np.clip(cumulative - base[all_seg], 0, 1)
+    if segments > 0:
+        keys[segment_ends - 1] = np.arange(1, segments + 1)
+
+    node_segment = np.full(C.node_count, -1, dtype=np.int64)
+    node_segment[nodes] = np.arange(segments)
+
+    # walks stop at terminal nodes and at nodes pi has no action for
+    stops = C.terminal | (actions < 0)
+    return keys, outcomes, node_segment, C.reward.copy(), C.terminal.copy(), stops
+
+def __simulate(table: SamplingTable, start: int, max_steps: int, episodes: int,
+               seed: np.random.SeedSequence) -> RolloutStats:
+    keys, outcomes, node_segment, reward, terminal, stops = table
+    rng = np.random.default_rng(seed)
+
+    state = np.full(episodes, start, dtype=np.int64)
+    returns = np.full(episodes, reward[start])
+    lengths = np.zeros(episodes, dtype=np.int64)
+    live = np.arange(episodes) if not stops[start] else np.arange(0)
+
+    for _ in range(max_steps):
+        if len(live) == 0:
+            break
+
+        seg = node_segment[state[live]]
+        next_state = outcomes[np.searchsorted(keys, seg + rng.random(len(live)), side='right')]
+
+        state[live] = next_state
+        returns[live] += reward[next_state]
+        lengths[live] += 1
+        live = live[~stops[next_state]]
+
+    return RolloutStats(
+        episodes=episodes,
+        return_sum=float(returns.sum()),
+        return_sum_squares=float(np.square(returns).sum()),
+        min_return=float(returns.min()),
+        max_return=float(returns.max()),
+        length_sum=int(lengths.sum()),
+        terminal_count=int(np.count_nonzero(terminal[state]))
+    )
+
+# Vectorized counterpart of utility.run_policy: simulates the episodes in
+# batches of batch_size walkers that all step at once. Every batch gets its own
+# RNG stream spawned from seed, so the result for a seed does not depend on the
+# number of processes.
+def batch_run_policy(G: Graph, start: str, pi: Dict[str, str], max_steps: int,
+                     episodes: int, seed: int=None, processes: int=1,
+                     batch_size: int=10_000) -> RolloutStats:
+    assert episodes > 0
+
+    C = G.compile()
+    table = __sampling_table(C, pi)
+
+    batches: List[int] = [batch_size] * (episodes // batch_size)
+    if episodes % batch_size > 0:
+        batches.append(episodes % batch_size)
+
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    args = (repeat(table), repeat(C.index[start]), repeat(max_steps), batches, seeds)
+
+    stats = RolloutStats()
+    if processes == 1:
+        for batch_stats in map(__simulate, *args):
+            stats.merge(batch_stats)
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            for batch_stats in pool.map(__simulate, *args):
+                stats.merge(batch_stats)
+
+    return stats
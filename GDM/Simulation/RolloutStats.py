@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from math import inf, sqrt
+
+# Aggregated returns of many rollouts. Only running sums are stored so results
+# from separate batches or processes can be merged without per step lists.
+@dataclass
+class RolloutStats:
+    episodes: int = 0
+    return_sum: float = 0.0
+    return_sum_squares: float = 0.0
+    min_return: float = inf
+    max_return: float = -inf
+    length_sum: int = 0
+    terminal_count: int = 0
+
+    def merge(self, other: 'RolloutStats'):
+        self.episodes += other.episodes
+        self.return_sum += other.return_sum
+        self.return_sum_squares += other.return_sum_squares
+        self.min_return = min(self.min_return, other.min_return)
+        self.max_return = max(self.max_return, other.max_return)
+        self.length_sum += other.length_sum
+        self.terminal_count += other.terminal_count
+
+    @property
+    def mean_return(self) -> float:
+        return self.return_sum / self.episodes
+
+    @property
+    def std_return(self) -> float:
+        mean = self.mean_return
+        return sqrt(max(0.0, self.return_sum_squares / self.episodes - mean*mean))
+
+    @property
+    def mean_length(self) -> float:
+        return self.length_sum / self.episodes
+
+    @property
+    def terminal_rate(self) -> float:
+        return self.terminal_count / self.episodes
@@ -0,0 +1,2 @@
+from .Rollout import batch_run_policy
+from .RolloutStats import RolloutStats
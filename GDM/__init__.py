@@ -1,3 +1,9 @@
 from . import ADP
+from . import Analytics
+from . import Batch
+from . import Cache
 from . import utility
-from . import Graph
\ No newline at end of file
+from . import Graph
+from . import IO
+from . import Layout
+from . import Simulation
\ No newline at end of file
@@ -0,0 +1,41 @@
+import argparse
+import os
+import sys
+from time import perf_counter
+
+from .Batch import SOLVERS, batch_solve, config_grid, find_graphs
+
+# python -m GDM levels/ --solver value_iteration policy_iteration \
+#     --gamma 0.9 0.99 --theta 1e-4 1e-6 --output results.jsonl
+parser = argparse.ArgumentParser(
+    prog='python -m GDM',
+    description='Solve graph.json projects with every combination of solver, gamma, and theta.'
+)
+parser.add_argument('paths', nargs='+', help='graph.json files or directories to search for them')
+parser.add_argument('--solver', nargs='+', default=['value_iteration'], choices=sorted(SOLVERS))
+parser.add_argument('--gamma', nargs='+', type=float, default=[0.95])
+parser.add_argument('--theta', nargs='+', type=float, default=[1e-6])
+parser.add_argument('--max-iteration', type=int, default=1000)
+parser.add_argument('--backend', choices=['python', 'numpy'], default='python',
+                    help='numpy runs value iteration on the compiled graph and policy iteration with exact evaluation')
+parser.add_argument('--seed', type=int, default=None, help='seed for random_policy')
+parser.add_argument('--processes', type=int, default=os.cpu_count())
+parser.add_argument('--cache', help='directory of a solver result cache to reuse results of unchanged graphs')
+parser.add_argument('--cache-size', type=int, default=256, help='cache size bound in MB')
+parser.add_argument('--output', default='results.jsonl')
+args = parser.parse_args()
+
+graphs = find_graphs(args.paths)
+if len(graphs) == 0:
+    print('no graph.json files found')
+    sys.exit(1)
+
+configs = config_grid(args.solver, args.gamma, args.theta, max_iteration=args.max_iteration,
+                      backend=args.backend, seed=args.seed)
+
+start = perf_counter()
+failures = batch_solve(graphs, configs, args.output, args.processes, args.cache,
+                       args.cache_size*1024*1024)
+print(f'{len(graphs)} graphs x {len(configs)} configs in {perf_counter() - start:.2f}s, '
+      f'{failures} failed, results in {args.output}')
+sys.exit(1 if failures > 0 else 0)
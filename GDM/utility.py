@@ -1,18 +1,39 @@
-from typing import Dict, List, Tuple
-from random import choice, random
+from typing import Dict, List, Optional, Tuple
+from random import choice
 from math import inf
 
-from .Graph import Graph
+from .Graph import Edge, Graph
+
+def __edge_utility(G: Graph, e: Edge, gamma: float) -> float:
+    nodes = G.nodes
+    return e.expected_reward(G) + gamma*sum(prob * nodes[n_tgt].utility for n_tgt, prob in e.probability)
 
 def calculate_utility(G: Graph, src: str, tgt: str, gamma: float) -> float:
-    return sum(prob * (G.reward(n_tgt) + gamma*G.utility(n_tgt)) for n_tgt, prob in G.get_edge(src, tgt).probability)
+    return __edge_utility(G, G.get_edge(src, tgt), gamma)
 
-def calculate_max_utility(G: Graph, n: str, gamma: float) -> List[Tuple[str, float]]:
+# Backs up node n once, returning its best neighbor (the first one on ties)
+# and that neighbor's utility. Like CompiledGraph.best_actions, terminal nodes
+# and dead ends (see GDM.Analytics.dead_ends) get (None, 0).
+def best_action(G: Graph, n: str, gamma: float) -> Tuple[Optional[str], float]:
     node = G.get_node(n)
-    if node.is_terminal:
-        return 0
+    if node.is_terminal or len(node.neighbors) == 0:
+        return None, 0
+
+    nodes = G.nodes
+    edges = G.edges
+    best_n = None
+    best_u = -inf
+    for n_p in node.neighbors:
+        e = edges[(n, n_p)]
+        u = e.expected_reward(G) + gamma*sum(prob * nodes[n_tgt].utility for n_tgt, prob in e.probability)
+        if u > best_u:
+            best_u = u
+            best_n = n_p
+
+    return best_n, best_u
 
-    return max(calculate_utility(G, n, n_p, gamma) for n_p in node.neighbors)
+def calculate_max_utility(G: Graph, n: str, gamma: float) -> float:
+    return best_action(G, n, gamma)[1]
 
 def reset_utility(G: Graph):
     for n in G.nodes:
@@ -21,28 +42,19 @@ def reset_utility(G: Graph):
 def create_random_policy(G: Graph) -> Dict[str, str]:
     pi: dict[str, str] = {} 
     for n in G.nodes:
-        if not G.get_node(n).is_terminal:
-            pi[n] = choice(list(G.neighbors(n)))
+        node = G.get_node(n)
+        if not node.is_terminal and len(node.neighbors) > 0:
+            pi[n] = choice(list(node.neighbors))
 
     return pi
 
+# Terminal nodes and dead ends have no action and are left out.
 def create_policy(G: Graph, gamma: float) -> Dict[str, str]:
     pi: Dict[str, str] = {}
     for n in G.nodes:
-        if G.get_node(n).is_terminal:
-            continue
-
-        best_u = -inf
-        best_n: str
-
-        for n_p in G.neighbors(n):
-            u = calculate_utility(G, n, n_p, gamma)
-            
-            if u > best_u:
-                best_u = u
-                best_n = n_p
-
-        pi[n] = best_n
+        best_n, _ = best_action(G, n, gamma)
+        if best_n is not None:
+            pi[n] = best_n
 
     return pi
 
@@ -55,14 +67,7 @@ def run_policy(G: Graph, start: str, pi: Dict[str, str], max_steps: int) -> Tupl
         if G.nodes[cur_state].is_terminal:
             break
         
-        tgt_state = pi[cur_state]
-        p = random()
-        for next_state, probability in G.get_edge(cur_state, tgt_state).probability:
-            if p <= probability:
-                tgt_state = next_state
-                break
-            else:
-                p -= probability
+        tgt_state = G.get_edge(cur_state, pi[cur_state]).sample()
 
         states.append(tgt_state)
         rewards.append(G.nodes[tgt_state].reward)
@@ -0,0 +1,55 @@
+# Runs the benchmark suite and writes the results as JSON, e.g.
+#
+#   python -m benchmarks --sizes 1000 10000 --output before.json
+#   python -m benchmarks --sizes 1000 10000 --output after.json --compare before.json
+#
+# Sizes up to 1M nodes work, but the python solvers take a long time there;
+# narrow the run with --scenario.
+import argparse
+import fnmatch
+
+from .harness import compare, load, run_suite, save
+from .scenarios import all_scenarios
+
+DEFAULT_SIZES = [1_000, 10_000]
+
+
+def main():
+    scenarios = all_scenarios()
+
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES)
+    parser.add_argument('--scenario', nargs='+', default=['*'],
+                        help='glob patterns over scenario keys, e.g. "value_iteration*"')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--compare', help='earlier results to compare the median times with')
+    parser.add_argument('--list', action='store_true', help='list the scenario keys and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for scenario in scenarios:
+            print(scenario.key)
+        return
+
+    scenarios = [
+        s for s in scenarios
+        if any(fnmatch.fnmatchcase(s.key, pattern) for pattern in args.scenario)
+    ]
+
+    print(f'{"scenario":<60} {"nodes":>10} {"median (s)":>12} {"peak (MB)":>10}')
+    def report(result):
+        print(f'{result["scenario"]:<60} {result["nodes"]:>10} {result["median"]:>12.4f} {result["peak_mb"]:>10.1f}')
+
+    suite = run_suite(scenarios, args.sizes, args.seed, args.repeat, report)
+    save(args.output, suite)
+
+    if args.compare is not None:
+        print(f'\n{"scenario":<60} {"nodes":>10} {"new/old":>10}')
+        for (key, size), ratio in compare(load(args.compare), suite).items():
+            print(f'{key:<60} {size:>10} {ratio:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# Seeded generators of synthetic level graphs. The same arguments always give
+# the same graph, so results of separate benchmark runs can be compared.
+from math import isqrt
+from random import Random
+from typing import List, Tuple
+
+from GDM.Graph import Graph
+
+
+def layer_name(depth: int, index: int) -> str:
+    return 'start' if depth == 0 and index == 0 else f'{depth}-{index}'
+
+# Levels laid out in layers of layer_width nodes (about sqrt(nodes) by
+# default), like a game's progression:
+#
+#   - every non-terminal node has fan_out edges to random nodes of the next
+#     layer, and with probability back_edge_probability one more edge back to
+#     the previous layer
+#   - an edge reaches its target with probability 1 - slip; the slip is split
+#     over extra outcomes - 1 other nodes of the target's layer
+#   - the last layer is terminal, as is any other node with probability
+#     terminal_probability
+#   - rewards are uniform in [-1, 1]
+#
+# fan_out and outcomes are inclusive (low, high) ranges drawn per node and per
+# edge. The first node is named "start", like in the editor.
+def layered_level_graph(nodes: int, seed: int=0, layer_width: int=None,
+                        fan_out: Tuple[int, int]=(1, 3), outcomes: Tuple[int, int]=(1, 3),
+                        slip: float=0.2, back_edge_probability: float=0.05,
+                        terminal_probability: float=0.01, graph_type: type=Graph) -> Graph:
+    assert nodes > 1
+    rng = Random(seed)
+    if layer_width is None:
+        layer_width = max(2, isqrt(nodes))
+
+    layers: List[List[str]] = []
+    for i in range(nodes):
+        depth, index = divmod(i, layer_width)
+        if index == 0:
+            layers.append([])
+
+        layers[depth].append(layer_name(depth, index))
+
+    G = graph_type()
+    for depth, layer in enumerate(layers):
+        last = depth == len(layers) - 1
+        for name in layer:
+            terminal = last or (name != 'start' and rng.random() < terminal_probability)
+            G.add_default_node(name, reward=rng.uniform(-1, 1), terminal=terminal)
+
+    def add_edge(src: str, layer: List[str], tgt: str):
+        count = min(rng.randint(*outcomes), len(layer))
+        others = [n for n in rng.sample(layer, count) if n != tgt][:count - 1]
+        if len(others) == 0:
+            G.add_default_edge(src, tgt, [(tgt, 1.0)])
+            return
+
+        p_other = slip / len(others)
+        G.add_default_edge(src, tgt, [(tgt, 1 - p_other*len(others))] + [(n, p_other) for n in others])
+
+    for depth, layer in enumerate(layers[:-1]):
+        next_layer = layers[depth + 1]
+        for name in layer:
+            if G.is_terminal(name):
+                continue
+
+            for tgt in rng.sample(next_layer, min(rng.randint(*fan_out), len(next_layer))):
+                add_edge(name, next_layer, tgt)
+
+            if depth > 0 and rng.random() < back_edge_probability:
+                previous_layer = layers[depth - 1]
+                add_edge(name, previous_layer, rng.choice(previous_layer))
+
+    return G
@@ -0,0 +1,45 @@
+# Times Graph.incoming_edges and Graph.remove_node on generated level graphs of
+# increasing size. The degree of a node does not grow with the graph, so the
+# per call cost should stay flat.
+#
+#   python -m benchmarks.graph_operations
+from random import Random
+from time import perf_counter
+from typing import List
+
+from GDM.Graph import Graph
+
+from .generators import layered_level_graph
+
+SIZES = [1_000, 10_000, 100_000]
+CALLS = 1_000
+
+
+def time_incoming_edges(G: Graph, names: List[str]) -> float:
+    start = perf_counter()
+    for name in names:
+        G.incoming_edges(name)
+
+    return (perf_counter() - start) / len(names)
+
+def time_remove_node(G: Graph, names: List[str]) -> float:
+    start = perf_counter()
+    for name in names:
+        G.remove_node(name)
+
+    return (perf_counter() - start) / len(names)
+
+def main():
+    print(f'{"nodes":>10} {"incoming_edges (us)":>20} {"remove_node (us)":>18}')
+    for size in SIZES:
+        G = layered_level_graph(size)
+        names = [n for n in G.nodes if n != 'start']
+        names = Random(1).sample(names, min(CALLS, len(names)))
+
+        incoming = time_incoming_edges(G, names)
+        remove = time_remove_node(G, names)
+        print(f'{size:>10} {incoming*1e6:>20.2f} {remove*1e6:>18.2f}')
+
+
+if __name__ == '__main__':
+    main()
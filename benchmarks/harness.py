@@ -0,0 +1,122 @@
+# Runs scenarios on generated graphs and collects their timings and peak
+# memory in a JSON document that can be compared with an earlier run.
+import json
+import platform
+import random
+import subprocess
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from statistics import median
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from GDM.Graph import Graph
+
+from .generators import layered_level_graph
+
+
+# run is timed on a graph made by layered_level_graph(size, seed). Scenarios
+# that change the graph set mutates so every repeat gets a fresh one.
+@dataclass
+class Scenario:
+    name: str
+    run: Callable[[Graph], Any]
+    params: Dict[str, Any] = field(default_factory=dict)
+    mutates: bool = False
+
+    @property
+    def key(self) -> str:
+        if len(self.params) == 0:
+            return self.name
+
+        return f'{self.name}[{",".join(f"{k}={v}" for k, v in self.params.items())}]'
+
+
+def metadata() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+    }
+
+# Times repeat runs, then runs once more under tracemalloc for the peak of the
+# memory allocated during the run (tracing slows the run, so it is not timed).
+def run_scenario(scenario: Scenario, size: int, seed: int, repeat: int) -> Dict[str, Any]:
+    G = layered_level_graph(size, seed)
+    nodes = len(G.nodes)
+    edges = len(G.edges)
+
+    seconds: List[float] = []
+    for i in range(repeat):
+        if scenario.mutates and i > 0:
+            G = layered_level_graph(size, seed)
+
+        random.seed(seed)
+        start = perf_counter()
+        scenario.run(G)
+        seconds.append(perf_counter() - start)
+
+    if scenario.mutates:
+        G = layered_level_graph(size, seed)
+
+    random.seed(seed)
+    tracemalloc.start()
+    scenario.run(G)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'scenario': scenario.key,
+        'size': size,
+        'seed': seed,
+        'nodes': nodes,
+        'edges': edges,
+        'seconds': seconds,
+        'min': min(seconds),
+        'median': median(seconds),
+        'peak_mb': peak / (1024*1024),
+    }
+
+def run_suite(scenarios: List[Scenario], sizes: List[int], seed: int, repeat: int,
+              report: Callable[[Dict[str, Any]], None]=None) -> Dict[str, Any]:
+    results = []
+    for size in sizes:
+        for scenario in scenarios:
+            result = run_scenario(scenario, size, seed, repeat)
+            results.append(result)
+            if report is not None:
+                report(result)
+
+    return {'metadata': metadata(), 'results': results}
+
+# Ratio of the median times of the results present in both runs, keyed by
+# (scenario, size); below 1 means the new run is faster.
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[Tuple[str, int], float]:
+    old_results = {(r['scenario'], r['size']): r for r in old['results']}
+    ratios: Dict[Tuple[str, int], float] = {}
+    for r in new['results']:
+        key = (r['scenario'], r['size'])
+        if key in old_results and old_results[key]['median'] > 0:
+            ratios[key] = r['median'] / old_results[key]['median']
+
+    return ratios
+
+def save(path: str, suite: Dict[str, Any]):
+    with open(path, 'w') as f:
+        json.dump(suite, f, indent=2)
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,56 @@
+# Compares the peak RSS of building a generated level graph with about 1M
+# edges using the default Graph layout and CompactGraph. Every layout is built in a fresh
+# process so the peaks do not mix.
+#
+#   python -m benchmarks.memory [--edges 1000000]
+import argparse
+import resource
+import subprocess
+import sys
+from time import perf_counter
+
+from GDM.Graph import CompactGraph, Graph
+
+from .generators import layered_level_graph
+
+# layered_level_graph draws 1 to 3 edges per node
+EDGES_PER_NODE = 2
+
+LAYOUTS = {
+    'default': Graph,
+    'compact': CompactGraph,
+}
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024*1024 if sys.platform == 'darwin' else 1024)
+
+def measure(layout: str, edges: int):
+    start = perf_counter()
+    G = layered_level_graph(edges // EDGES_PER_NODE, graph_type=LAYOUTS[layout])
+    print(f'{layout},{len(G.nodes)},{len(G.edges)},{perf_counter() - start:.2f},{peak_rss_mb():.1f}')
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--edges', type=int, default=1_000_000)
+    parser.add_argument('--layout', choices=LAYOUTS.keys())
+    args = parser.parse_args()
+
+    if args.layout is not None:
+        measure(args.layout, args.edges)
+        return
+
+    print(f'{"layout":>10} {"nodes":>10} {"edges":>10} {"build (s)":>10} {"peak RSS (MB)":>14}')
+    for layout in LAYOUTS:
+        out = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.memory', '--layout', layout, '--edges', str(args.edges)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        name, nodes, edge_count, seconds, rss = out.strip().split(',')
+        print(f'{name:>10} {nodes:>10} {edge_count:>10} {seconds:>10} {rss:>14}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+# Timed scenarios of the benchmark suite: every solver variant, graph
+# mutations, and the editor's save and load of graph.json.
+import os
+from random import Random
+from tempfile import TemporaryDirectory
+from typing import List
+
+from GDM.ADP import (
+    batched_value_iteration, policy_iteration, prioritized_value_iteration,
+    topological_value_iteration, value_iteration
+)
+from GDM.Graph import Graph
+from GDM.IO import load_graph_json, write_graph_json
+from GDM.utility import calculate_utility
+
+from .harness import Scenario
+
+GAMMA = 0.95
+THETA = 1e-6
+MAX_ITERATION = 1_000
+
+# discount factors compared by the gamma_sweep scenarios
+GAMMAS = [0.8, 0.85, 0.9, 0.95, 0.97, 0.98, 0.99, 0.995]
+
+# number of nodes or edges touched by the mutation scenarios
+MUTATIONS = 1_000
+
+
+def __sample(names: List[str], seed: int=1) -> List[str]:
+    names = [n for n in names if n != 'start']
+    return Random(seed).sample(names, min(MUTATIONS, len(names)))
+
+def remove_nodes(G: Graph):
+    for name in __sample(list(G.nodes)):
+        G.remove_node(name)
+
+def edge_churn(G: Graph):
+    keys = Random(1).sample(list(G.edges), min(MUTATIONS, len(G.edges)))
+    probabilities = [G.get_edge(src, tgt).probability for src, tgt in keys]
+    for src, tgt in keys:
+        G.remove_edge(src, tgt)
+
+    for (src, tgt), p in zip(keys, probabilities):
+        G.add_default_edge(src, tgt, p)
+
+def all_edge_utilities(G: Graph):
+    for src, tgt in G.edges:
+        calculate_utility(G, src, tgt, GAMMA)
+
+# graph.json only has neighbors, so the loaded graph has deterministic edges
+def save_and_load(G: Graph):
+    with TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'graph.json')
+        write_graph_json(path, {'scale': 1.0}, (
+            (name, {'x': 0.0, 'y': 0.0, 'reward': n.reward, 'neighbors': list(n.neighbors)})
+            for name, n in G.nodes.items()
+        ))
+        load_graph_json(path)
+
+def gamma_sweep(G: Graph):
+    for gamma in GAMMAS:
+        value_iteration(G, MAX_ITERATION, gamma, THETA, backend='numpy')
+
+def solver_scenarios() -> List[Scenario]:
+    scenarios: List[Scenario] = []
+    for backend in ('python', 'numpy'):
+        for in_place in (False, True):
+            scenarios.append(Scenario(
+                'value_iteration',
+                lambda G, in_place=in_place, backend=backend:
+                    value_iteration(G, MAX_ITERATION, GAMMA, THETA, in_place, backend=backend),
+                {'backend': backend, 'in_place': in_place}
+            ))
+
+    for modified in (False, True):
+        for in_place in (False, True):
+            for policy_k in (5, 20):
+                scenarios.append(Scenario(
+                    'policy_iteration',
+                    lambda G, modified=modified, in_place=in_place, policy_k=policy_k:
+                        policy_iteration(G, GAMMA, modified, in_place, policy_k),
+                    {'modified': modified, 'in_place': in_place, 'policy_k': policy_k}
+                ))
+
+    scenarios.append(Scenario('policy_iteration', lambda G: policy_iteration(G, GAMMA, exact=True),
+                              {'exact': True}))
+    scenarios.append(Scenario('prioritized_value_iteration',
+                              lambda G: prioritized_value_iteration(G, GAMMA, THETA)))
+    scenarios.append(Scenario('topological_value_iteration',
+                              lambda G: topological_value_iteration(G, MAX_ITERATION, GAMMA, THETA)))
+    scenarios.append(Scenario('gamma_sweep', gamma_sweep, {'gammas': len(GAMMAS), 'batched': False}))
+    scenarios.append(Scenario('gamma_sweep',
+                              lambda G: batched_value_iteration(G, MAX_ITERATION, GAMMAS, THETA),
+                              {'gammas': len(GAMMAS), 'batched': True}))
+    return scenarios
+
+def graph_scenarios() -> List[Scenario]:
+    return [
+        Scenario('remove_node', remove_nodes, {'count': MUTATIONS}, mutates=True),
+        Scenario('edge_churn', edge_churn, {'count': MUTATIONS}),
+        Scenario('calculate_utility', all_edge_utilities),
+        Scenario('save_and_load', save_and_load),
+    ]
+
+def all_scenarios() -> List[Scenario]:
+    return solver_scenarios() + graph_scenarios()
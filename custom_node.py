@@ -1,6 +1,6 @@
 import tkinter as tk
 from dataclasses import dataclass
-from typing import Set, List
+from typing import Optional
 
 from GDM.Graph.Node import Node
 
@@ -10,6 +10,7 @@ class CustomNode(Node):
     y: float
     rect_id: int
     reward_var: tk.DoubleVar
-    frame: tk.Frame
-    entry: tk.Entry
-    levels: List[str]
+    # created the first time the node is drawn in detail
+    frame: Optional[tk.Frame]
+    entry: Optional[tk.Entry]
+    window_id: Optional[int]
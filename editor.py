@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Set, Tuple
 import json
 import os
 import sys
@@ -8,15 +8,33 @@ from os.path import join
 
 from custom_edge import CustomEdge
 from custom_node import CustomNode
+from input_coalescer import InputCoalescer
+from segment_store import SegmentStore
+from spatial_index import GridIndex
+from GDM.Analytics import bfs_depths
 from GDM.Graph import Graph
+from GDM.IO import GraphJSONReader, write_graph_json
+from GDM.Layout import LayoutWorker
 from random import choice
 
 NODE_WIDTH  = 60
 NODE_HEIGHT = 60
 
+# below this scale nodes are drawn as plain rectangles without their widgets
+DETAIL_SCALE = 0.5
+
+# widgets of nodes this many pixels outside of the canvas are still created
+CULL_MARGIN = 100
+
+# drags, pans, and zooms are applied at most once per this many milliseconds
+FRAME_MS = 16
+
+# how often the canvas picks up positions from a running layout
+LAYOUT_POLL_MS = 100
+
 
 class Editor:
-    def __init__(self, root, working_dir):
+    def __init__(self, root, working_dir, frame_ms: float=FRAME_MS):
         self.working_dir = working_dir
 
         root.protocol("WM_DELETE_WINDOW", self.on_exit)
@@ -35,41 +53,69 @@ class Editor:
 
         self.root.bind("<MouseWheel>", self.on_scale)
 
-        self.canvas = tk.Canvas(self.root, width=1800, height=980, bg="gray20")
+        # Ctrl+L lays out the whole graph
+        self.layout_worker = None
+        self.root.bind("<Control-l>", self.start_layout)
+
+        # Panning scrolls the view and zooming scales the canvas items, both
+        # done by Tk. Node x and y stay in model coordinates; an item is at its
+        # model coordinates times scale in canvas coordinates.
+        self.canvas = tk.Canvas(self.root, width=1800, height=980, bg="gray20", confine=False)
         self.canvas.pack(fill="both", expand=1)
+        self.canvas.bind("<Configure>", lambda event: self.refresh_view())
+
+        # motion and wheel events only record deltas; they are applied once
+        # per frame. F3 shows how many events went into how many frames.
+        self.input = InputCoalescer(self.root, frame_ms, self.on_frame)
+        self.debug_label = None
+
+        # Only nodes in or near the visible region get their label and entry,
+        # found through a grid over the model coordinates of the nodes.
+        self.index = GridIndex(4 * NODE_WIDTH)
+        self.visible_nodes: Set[str] = set()
+        self.widget_bindings: Dict[str, List[Tuple[str, Callable]]] = {}
+
+        self.segments = SegmentStore(join(working_dir, 'segments'))
 
         lvl_ids = [file_name.split(".")[0] for file_name in os.listdir(os.path.join(working_dir, 'segments'))]
-        skipped_ids = []
+        unplaced_ids = set(lvl_ids)
+        neighbors: Dict[str, List[str]] = {}
 
         ## Build the graph
         self.G = Graph()
-        with open(join(working_dir, 'graph.json')) as f:
-            data = json.load(f)
-            self.scale: float = data['scale']
-            graph = data['graph']
-
-            ## Create Nodes
-            for node_name, node_values in graph.items():
-                if node_name in lvl_ids:
-                    lvl_ids.remove(node_name)
-                    self.create_node(node_name, node_values)
-                elif node_name == 'start':
-                    self.create_node(node_name, node_values)
-                else:
-                    skipped_ids.append(node_name)
-                    print(f'Level file does not exist for id: {node_name}')
-
-            ## Create Edges
-            for node_name, node_values in graph.items():
-                if node_name in skipped_ids:
-                    continue
-
-                for neighbor in node_values["neighbors"]:
+        self.scale: float = 1.0
+        reader = GraphJSONReader(join(working_dir, 'graph.json'))
+
+        ## Create Nodes
+        for node_name, node_values in reader:
+            self.scale = reader.metadata.get('scale', self.scale)
+
+            if node_name in unplaced_ids:
+                unplaced_ids.remove(node_name)
+            elif node_name != 'start':
+                print(f'Level file does not exist for id: {node_name}')
+                continue
+
+            self.create_node(node_name, node_values)
+            neighbors[node_name] = node_values["neighbors"]
+
+        # the reader only sees top level keys once it has passed them, so a
+        # scale stored after "graph" is known only now
+        scale = reader.metadata.get('scale', self.scale)
+        if scale != self.scale:
+            self.scale = scale
+            for N in self.G.nodes.values():
+                self.draw_node(N)
+
+        ## Create Edges
+        for node_name, node_neighbors in neighbors.items():
+            for neighbor in node_neighbors:
+                if self.G.has_node(neighbor):
                     self.create_edge(node_name, neighbor)
 
         x = 0
         y = 0
-        for new_id in lvl_ids:
+        for new_id in (lvl_id for lvl_id in lvl_ids if lvl_id in unplaced_ids):
             self.create_node(new_id, {
                 "x": x,
                 "y": y,
@@ -80,6 +126,10 @@ class Editor:
             x += 20
             y += 20
 
+        # nothing has been placed by hand yet, so lay out the imported levels
+        if len(unplaced_ids) > 0 and all(node_name == 'start' for node_name in neighbors):
+            self.start_layout()
+
         # preview box
         self.preview_frame = tk.Frame(self.canvas)
         self.preview_frame.place(x=-1000, y=-1000) # off screen
@@ -88,6 +138,8 @@ class Editor:
         self.preview_label.pack()
         # self.label = tk.Label(self.canvas, width=32, height=16, font="TkFixedFont")
 
+        self.refresh_view()
+
     ############# Create
     def create_node(self, node_name, node_values):
         x = node_values["x"]
@@ -101,15 +153,6 @@ class Editor:
             tags="all"
         )
 
-        frame = tk.Frame(self.canvas, bg="black")
-        frame.place(
-            x = x * self.scale + self.scale,
-            y = y * self.scale + self.scale
-        )
-
-        label = tk.Label(frame, text=node_name, width=ceil(5*self.scale), bg="black", fg="white")
-        label.pack()
-
         def on_reward_change():
             self.G.get_node(node_name).reward = reward_var.get()
 
@@ -119,25 +162,6 @@ class Editor:
             "write",
             lambda _var, _index, _mode: on_reward_change,
         )
-        r = tk.Entry(frame, textvariable=reward_var, width=ceil(3*self.scale), bg="black", fg="white")
-        r.pack()
-
-        if node_name == 'start':
-           levels = []
-        else:
-            with open(join(self.working_dir, 'segments', f'{node_name}.txt')) as f:
-                levels = []
-                level = []
-                for line in f:
-                    l = line.strip()
-                    if l == "&":
-                        levels.append('\n'.join(level))
-                        level = []
-                    else:
-                        level.append(l)
-
-                levels.append('\n'.join(level))
-
         ## Add node to the graph
         N = CustomNode(
             name = node_name,
@@ -149,12 +173,13 @@ class Editor:
             y = y,
             rect_id = rect,
             reward_var=reward_var,
-            frame = frame,
-            entry = r,
-            levels = levels
+            frame = None,
+            entry = None,
+            window_id = None
         )
 
         self.G.add_node(N)
+        self.index.insert(node_name, x, y)
 
         ## move nodes around
         def on_node_click(event):
@@ -165,28 +190,18 @@ class Editor:
             dx = event.x_root - self.scroll_x
             dy = event.y_root - self.scroll_y
 
-            self.update_node(N, dx, dy)
+            self.input.add(('drag', node_name), lambda dx, dy: self.update_node(N, dx, dy), dx, dy)
 
             self.scroll_x = event.x_root
             self.scroll_y = event.y_root
 
-        self.canvas.tag_bind(rect, "<Button-1>", on_node_click)
-        self.canvas.tag_bind(rect, "<B1-Motion>", on_node_drag)
-
-        label.bind("<Button-1>", on_node_click)
-        label.bind("<B1-Motion>", on_node_drag)
-
-        r.bind("<Button-1>", on_node_click)
-        r.bind("<B1-Motion>", on_node_drag)
-
         ## create edges between nodes
         # Start Drag Line
         def start_drag(event):
             self.drag_line = self.canvas.create_line(
                 (N.x + NODE_WIDTH) * self.scale,
                 (N.y + NODE_HEIGHT / 2) * self.scale,
-                event.x_root,
-                event.y_root - (NODE_HEIGHT * self.scale),
+                *self.event_position(event),
                 width=2*self.scale,
                 fill="yellow",
                 arrow=tk.LAST,
@@ -200,70 +215,52 @@ class Editor:
                 self.drag_line,
                 coords[0],
                 coords[1],
-                event.x_root,
-                event.y_root - (NODE_HEIGHT * self.scale)
+                *self.event_position(event)
             )
 
         # End Drag Line
         def end_drag(event):
             coords = self.canvas.coords(self.drag_line)
-            overlapping = self.canvas.find_overlapping(
-                coords[2],
-                coords[3],
-                coords[2] + 10*self.scale,
-                coords[3] + 10*self.scale
-            )
+            tgt_id = self.node_at(coords[2] / self.scale, coords[3] / self.scale)
 
-            if len(overlapping) == 2:
-                # found connection
-                tgt_node_tkid = (
-                    overlapping[0] if overlapping[0] != self.drag_line else overlapping[1]
-                )
-
-                tgt_id = "1-a"
-                for n in self.G.nodes:
-                    if self.G.nodes[n].rect_id == tgt_node_tkid:
-                        tgt_id = n
-                        break
-
-                # neighbor = self.G.nodes[tgt_id]
-
-                # cannot connect to self and cannot add duplicate edges
-                if tgt_id != node_name and tgt_id not in N.neighbors:
-                    self.create_edge(node_name, tgt_id)
+            # cannot connect to self and cannot add duplicate edges
+            if tgt_id is not None and tgt_id != node_name and tgt_id not in N.neighbors:
+                self.create_edge(node_name, tgt_id)
 
             # Delet the drag line regardless
             self.canvas.delete(self.drag_line)
 
-        self.canvas.tag_bind(rect, "<ButtonPress-2>", start_drag)
-        self.canvas.tag_bind(rect, "<B2-Motion>", dragging)
-        self.canvas.tag_bind(rect, "<ButtonRelease-2>", end_drag)
-
-        label.bind("<ButtonPress-2>", start_drag)
-        label.bind("<B2-Motion>", dragging)
-        label.bind("<ButtonRelease-2>", end_drag)
-
-        r.bind("<ButtonPress-2>", start_drag)
-        r.bind("<B2-Motion>", dragging)
-        r.bind("<ButtonRelease-2>", end_drag)
-
         ## On Hover
         def on_enter(event):
-            self.preview_label.config(text=choice(N.levels))
-            self.preview_frame.place(x=(N.x + NODE_WIDTH + 1) * self.scale, y=N.y*self.scale)
+            levels = [] if node_name == 'start' else self.segments.get(node_name)
+            self.preview_label.config(text=choice(levels) if len(levels) > 0 else '')
+            self.preview_frame.place(
+                x=(N.x + NODE_WIDTH + 1) * self.scale - self.canvas.canvasx(0),
+                y=N.y * self.scale - self.canvas.canvasy(0)
+            )
+
+            # the cursor usually moves on to a neighbor next
+            self.segments.prefetch(n for n in N.neighbors if n != 'start')
 
         def on_exit(event):
             self.preview_frame.place(x=-1000, y=-1000)
 
-        self.canvas.tag_bind(rect, '<Enter>', on_enter)
-        self.canvas.tag_bind(rect, '<Leave>', on_exit)
-
-        r.bind('<Enter>', on_enter)
-        r.bind('<Leave>', on_exit)
+        # the label and entry are only created once the node is drawn in
+        # detail, see realize_widgets
+        bindings = [
+            ("<Button-1>", on_node_click),
+            ("<B1-Motion>", on_node_drag),
+            ("<ButtonPress-2>", start_drag),
+            ("<B2-Motion>", dragging),
+            ("<ButtonRelease-2>", end_drag),
+            ('<Enter>', on_enter),
+            ('<Leave>', on_exit),
+        ]
 
-        label.bind('<Enter>', on_enter)
-        label.bind('<Leave>', on_exit)
+        for sequence, handler in bindings:
+            self.canvas.tag_bind(rect, sequence, handler)
 
+        self.widget_bindings[node_name] = bindings
 
     def create_edge(self, src, tgt):
         N_src: CustomNode = self.G.get_node(src)
@@ -280,12 +277,13 @@ class Editor:
             tags="all"
         )
 
-        self.G.add_edge(CustomEdge(
+        E = CustomEdge(
             src=src,
             tgt=tgt,
             probability=[],
             line_id=line
-        ))
+        )
+        self.G.add_edge(E)
 
         ## Remove Edge
         def remove_edge_event():
@@ -300,21 +298,103 @@ class Editor:
     def key_press_handler(self, event):
         if event.keysym == 'Escape':
             self.on_exit()
+        elif event.keysym == 'F3':
+            self.toggle_debug_overlay()
 
     def scroll_start(self, event):
-        self.scroll_x = event.x
-        self.scroll_y = event.y
+        self.scroll_x = event.x_root
+        self.scroll_y = event.y_root
+
+    def toggle_debug_overlay(self):
+        if self.debug_label is None:
+            self.input.reset_stats()
+            self.debug_label = tk.Label(self.canvas, font="TkFixedFont", bg="black", fg="white")
+            self.debug_label.place(x=4, y=4)
+            self.update_debug_overlay()
+        else:
+            self.debug_label.destroy()
+            self.debug_label = None
+
+    def update_debug_overlay(self):
+        events = self.input.events
+        frames = self.input.frames
+        self.debug_label.config(
+            text=f"events: {events}  frames: {frames}  events/frame: {events / max(frames, 1):.1f}"
+        )
 
-    def update_node(self, n: CustomNode, dx: float, dy: float):
-        ## Update rectangle placement
-        self.canvas.move(n.rect_id, dx, dy)
-        self.canvas.itemconfig(n.rect_id, tags=("rect", "dragged"))
+    # canvas coordinates of the cursor, whichever widget got the event
+    def event_position(self, event) -> Tuple[float, float]:
+        return (
+            self.canvas.canvasx(event.x_root - self.canvas.winfo_rootx()),
+            self.canvas.canvasy(event.y_root - self.canvas.winfo_rooty())
+        )
 
-        x1, y1, _x2, _y2 = self.canvas.coords(n.rect_id)
-        # n.frame.place(x=x1+self.scale, y=y1+self.scale)
-        n.x += dx
-        n.y += dy
+    ############# Hit Testing
+    # The grid index holds the top left corner of every node, so the nodes
+    # covering a point are the ones with a corner at most a node size above
+    # and to the left of it. Coordinates are model coordinates.
+    def node_at(self, x: float, y: float) -> Optional[str]:
+        hits = list(self.index.query(x - NODE_WIDTH, y - NODE_HEIGHT, x, y))
+        if len(hits) == 0:
+            return None
+
+        # rectangles created later are drawn on top
+        return max(hits, key=lambda node_name: self.G.get_node(node_name).rect_id)
+
+    # nodes lying entirely within the box, e.g. for box selection
+    def nodes_in_box(self, x1: float, y1: float, x2: float, y2: float) -> List[str]:
+        return list(self.index.query(
+            min(x1, x2),
+            min(y1, y2),
+            max(x1, x2) - NODE_WIDTH,
+            max(y1, y2) - NODE_HEIGHT
+        ))
+
+    ############# Drawing
+    def viewport_size(self) -> Tuple[int, int]:
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            # not mapped yet
+            width = int(self.canvas.cget("width"))
+            height = int(self.canvas.cget("height"))
+
+        return width, height
+
+    def realize_widgets(self, n: CustomNode):
+        n.frame = tk.Frame(self.canvas, bg="black")
 
+        label = tk.Label(n.frame, text=n.name, width=ceil(5*self.scale), bg="black", fg="white")
+        label.pack()
+
+        n.entry = tk.Entry(n.frame, textvariable=n.reward_var, width=ceil(3*self.scale), bg="black", fg="white")
+        n.entry.pack()
+
+        for sequence, handler in self.widget_bindings[n.name]:
+            label.bind(sequence, handler)
+            n.entry.bind(sequence, handler)
+
+        # as a canvas item the frame is scrolled and scaled along with the rest
+        n.window_id = self.canvas.create_window(
+            (n.x + 1) * self.scale,
+            (n.y + 1) * self.scale,
+            window=n.frame,
+            anchor=tk.NW,
+            tags="all"
+        )
+
+    def show_widgets(self, n: CustomNode):
+        if n.frame is None:
+            self.realize_widgets(n)
+        else:
+            self.canvas.itemconfig(n.window_id, state=tk.NORMAL)
+            n.entry.config(width=ceil(3*self.scale))
+
+    def hide_widgets(self, n: CustomNode):
+        if n.window_id is not None:
+            self.canvas.itemconfig(n.window_id, state=tk.HIDDEN)
+
+    def draw_node(self, n: CustomNode):
         # rectangle
         self.canvas.coords(
             n.rect_id,
@@ -325,94 +405,163 @@ class Editor:
         )
 
         # frame
-        n.frame.place(
-            x = (n.x + 1) * self.scale,
-            y = (n.y + 1) * self.scale
+        if n.window_id is not None:
+            self.canvas.coords(n.window_id, (n.x + 1) * self.scale, (n.y + 1) * self.scale)
+
+    def draw_edge(self, e: CustomEdge):
+        N_src: CustomNode = self.G.get_node(e.src)
+        N_tgt: CustomNode = self.G.get_node(e.tgt)
+
+        self.canvas.coords(
+            e.line_id,
+            (N_src.x + NODE_WIDTH) * self.scale,
+            (N_src.y + NODE_HEIGHT / 2) * self.scale,
+            N_tgt.x * self.scale,
+            (N_tgt.y + NODE_HEIGHT / 2) * self.scale
         )
 
-        # entry
-        n.entry.config(width=ceil(3*self.scale))
+    # Shows the widgets of the nodes in or near the visible region, creating
+    # them on first use, and hides the ones that left it. Zoomed out, the
+    # rectangles are enough and no widgets are shown.
+    def refresh_view(self):
+        visible: Set[str] = set()
+        if self.scale >= DETAIL_SCALE:
+            width, height = self.viewport_size()
+            left = self.canvas.canvasx(0) / self.scale
+            top = self.canvas.canvasy(0) / self.scale
+            margin = CULL_MARGIN / self.scale
+            visible.update(self.index.query(
+                left - margin - NODE_WIDTH,
+                top - margin - NODE_HEIGHT,
+                left + width / self.scale + margin,
+                top + height / self.scale + margin
+            ))
+
+        for node_name in self.visible_nodes - visible:
+            self.hide_widgets(self.G.get_node(node_name))
+
+        for node_name in visible - self.visible_nodes:
+            self.show_widgets(self.G.get_node(node_name))
+
+        self.visible_nodes = visible
+
+    def update_node(self, n: CustomNode, dx: float, dy: float):
+        n.x += dx
+        n.y += dy
+        self.index.move(n.name, n.x, n.y)
+        self.draw_node(n)
 
         ## Update Edge coordinates
-        # incoming
+        # outgoing
         for tgt in n.neighbors:
-            line_id = self.G.get_edge(n.name, tgt).line_id
-            coords = self.canvas.coords(line_id)
-            self.canvas.coords(
-                line_id,
-                (n.x + NODE_WIDTH) * self.scale,
-                (n.y + NODE_HEIGHT / 2) * self.scale,
-                coords[2] ,
-                coords[3]
-            )
+            self.draw_edge(self.G.get_edge(n.name, tgt))
 
-        # outgoing
+        # incoming
         for edge in self.G.incoming_edges(n.name):
-            coords = self.canvas.coords(edge.line_id)
-            self.canvas.coords(
-                edge.line_id,
-                coords[0],
-                coords[1],
-                n.x * self.scale,
-                (n.y + NODE_HEIGHT / 2) * self.scale
-            )
+            self.draw_edge(edge)
+
+    def on_frame(self):
+        self.refresh_view()
+        if self.debug_label is not None:
+            self.update_debug_overlay()
 
     def scroll(self, event):
-        dx = event.x - self.scroll_x
-        dy = event.y - self.scroll_y
+        dx = event.x_root - self.scroll_x
+        dy = event.y_root - self.scroll_y
+        self.input.add('pan', self.pan, dx, dy)
 
-        for N in self.G.nodes.values():
-            self.update_node(N, dx, dy)
+        self.scroll_x = event.x_root
+        self.scroll_y = event.y_root
 
-        self.scroll_x = event.x
-        self.scroll_y = event.y
+    def pan(self, dx: float, dy: float):
+        self.canvas.scan_mark(0, 0)
+        self.canvas.scan_dragto(int(dx), int(dy), gain=1)
 
     def on_scale(self, event):
-        delta = 1 if event.delta >= 0 else -1
-        self.scale = min(1.0, max(0.1, self.scale + 0.01*delta))
+        self.input.add('zoom', self.zoom, 1 if event.delta >= 0 else -1)
+
+    def zoom(self, steps: int):
+        old_scale = self.scale
+        self.scale = min(1.0, max(0.1, round(self.scale + 0.01*steps, 2)))
+        if self.scale == old_scale:
+            return
+
+        # rectangles, lines, and frames are scaled around the canvas origin,
+        # where model coordinates times scale put them
+        factor = self.scale / old_scale
+        self.canvas.scale("all", 0, 0, factor, factor)
+
+        for node_name in self.visible_nodes:
+            self.G.get_node(node_name).entry.config(width=ceil(3*self.scale))
+
+    ############# Layout
+    def start_layout(self, event=None):
+        if self.layout_worker is not None:
+            self.layout_worker.stop()
+
+        # the worker gets a copy so the graph can be edited while it runs
+        snapshot = Graph()
+        for node_name in self.G.nodes:
+            snapshot.add_default_node(node_name)
+
+        for src, tgt in self.G.edges:
+            snapshot.add_default_edge(src, tgt)
+
+        self.layout_worker = LayoutWorker(snapshot, spacing=1.5*NODE_HEIGHT)
+        self.layout_worker.start()
+        self.root.after(LAYOUT_POLL_MS, self.poll_layout, self.layout_worker)
+
+    def poll_layout(self, worker: LayoutWorker):
+        # a newer layout replaced this one
+        if worker is not self.layout_worker:
+            return
+
+        positions, done = worker.latest()
+        if positions is not None:
+            self.apply_positions(positions)
+
+        if done:
+            self.layout_worker = None
+        else:
+            self.root.after(LAYOUT_POLL_MS, self.poll_layout, worker)
 
-        n: CustomNode
-        for n in self.G.nodes.values():
-            self.update_node(n, 0, 0)
+    def apply_positions(self, positions: Dict[str, Tuple[float, float]]):
+        for node_name, (x, y) in positions.items():
+            if not self.G.has_node(node_name):
+                continue
 
-    def on_exit(self):
-        # Figure out the depth of every node from the start node
-        queue: List[tuple[str, int]] = [("start", 0)]
-        depth: Dict[str, int] = {
-            "start": 0
-        }
-        visited = set()
+            N: CustomNode = self.G.get_node(node_name)
+            N.x = x
+            N.y = y
+            self.index.move(node_name, x, y)
+            self.draw_node(N)
 
-        while len(queue) > 0:
-            name, d = queue.pop()
-            new_depth = d + 1
+        for e in self.G.edges.values():
+            self.draw_edge(e)
 
-            for neighbor_name in self.G.neighbors(name):
-                if neighbor_name in visited:
-                    continue
+        self.refresh_view()
 
-                visited.add(neighbor_name)
-                depth[neighbor_name] = new_depth
-                queue.append((neighbor_name, new_depth))
+    def on_exit(self):
+        if self.layout_worker is not None:
+            self.layout_worker.stop()
 
-        data = {
-            "scale": self.scale,
-        }
-        graph = {}
+        # shortest distance from the start node; -1 if it cannot be reached
+        depth = bfs_depths(self.G) if self.G.has_node("start") else {}
+
+        self.segments.shutdown()
 
-        for node_name, N in self.G.nodes.items():
-            graph[node_name] = {
+        print("saving graph before exiting :D")
+        write_graph_json(
+            join(self.working_dir, "graph.json"),
+            {"scale": self.scale},
+            ((node_name, {
                 "x": N.x,
                 "y": N.y,
                 "reward": N.reward_var.get(),
                 "neighbors": list(N.neighbors),
-                "depth": depth[node_name]
-            }
-
-        data['graph'] = graph
-        print("saving graph before exiting :D")
-        with open(join(self.working_dir, "graph.json"), "w") as f:
-            json.dump(data, f, indent=2)
+                "depth": depth.get(node_name, -1)
+            }) for node_name, N in self.G.nodes.items())
+        )
 
         exit(0)
 
@@ -0,0 +1,61 @@
+from time import perf_counter
+from typing import Callable, Dict, Hashable, List, Optional
+
+
+# Collects input deltas and applies them at most once per frame. Tk delivers a
+# motion or wheel event for every small movement; instead of redrawing for each
+# one, add sums the deltas per key and a single flush is scheduled no sooner
+# than frame_ms after the previous one. The flush applies every key with its
+# summed deltas once, then calls on_frame.
+class InputCoalescer:
+    def __init__(self, widget, frame_ms: float=16, on_frame: Optional[Callable[[], None]]=None):
+        self.widget = widget
+        self.frame_ms = frame_ms
+        self.on_frame = on_frame
+
+        # counters for the debug overlay
+        self.events = 0
+        self.frames = 0
+
+        self.__pending: Dict[Hashable, Callable[..., None]] = {}
+        self.__deltas: Dict[Hashable, List[float]] = {}
+        self.__scheduled = False
+        self.__last_frame = 0.0
+
+    def add(self, key: Hashable, apply: Callable[..., None], *deltas: float):
+        self.events += 1
+        self.__pending[key] = apply
+
+        summed = self.__deltas.get(key)
+        if summed is None:
+            self.__deltas[key] = list(deltas)
+        else:
+            for i, d in enumerate(deltas):
+                summed[i] += d
+
+        if not self.__scheduled:
+            self.__scheduled = True
+            wait = self.frame_ms - (perf_counter() - self.__last_frame) * 1000
+            if wait > 0:
+                self.widget.after(int(wait), self.flush)
+            else:
+                self.widget.after_idle(self.flush)
+
+    def flush(self):
+        self.__scheduled = False
+        pending, self.__pending = self.__pending, {}
+        deltas, self.__deltas = self.__deltas, {}
+        if len(pending) == 0:
+            return
+
+        for key, apply in pending.items():
+            apply(*deltas[key])
+
+        self.frames += 1
+        self.__last_frame = perf_counter()
+        if self.on_frame is not None:
+            self.on_frame()
+
+    def reset_stats(self):
+        self.events = 0
+        self.frames = 0
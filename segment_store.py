@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from os.path import exists, join
+from threading import Lock
+from typing import Iterable, List, Set
+
+
+# Segments of a level are stored in segments/<id>.txt separated by lines
+# holding a single "&". They are only needed for the hover preview, so they
+# are read on first use, kept in a bounded LRU cache, and the segments of the
+# hovered node's neighbors are read ahead on a background thread.
+class SegmentStore:
+    def __init__(self, segments_dir: str, capacity: int=512):
+        self.segments_dir = segments_dir
+        self.capacity = capacity
+
+        self.__cache: OrderedDict[str, List[str]] = OrderedDict()
+        self.__pending: Set[str] = set()
+        self.__lock = Lock()
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='segment-prefetch')
+
+    def get(self, node_name: str) -> List[str]:
+        with self.__lock:
+            if node_name in self.__cache:
+                self.__cache.move_to_end(node_name)
+                return self.__cache[node_name]
+
+        levels = self.__read(node_name)
+        self.__insert(node_name, levels)
+        return levels
+
+    def prefetch(self, node_names: Iterable[str]):
+        with self.__lock:
+            names = [n for n in node_names if n not in self.__cache and n not in self.__pending]
+            self.__pending.update(names)
+
+        for node_name in names:
+            self.__executor.submit(self.__prefetch, node_name)
+
+    def shutdown(self):
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def __prefetch(self, node_name: str):
+        try:
+            self.__insert(node_name, self.__read(node_name))
+        finally:
+            with self.__lock:
+                self.__pending.discard(node_name)
+
+    def __insert(self, node_name: str, levels: List[str]):
+        with self.__lock:
+            self.__cache[node_name] = levels
+            self.__cache.move_to_end(node_name)
+            while len(self.__cache) > self.capacity:
+                self.__cache.popitem(last=False)
+
+    def __read(self, node_name: str) -> List[str]:
+        path = join(self.segments_dir, f'{node_name}.txt')
+        if not exists(path):
+            return []
+
+        # every segment is parsed, so the file is read whole
+        with open(path, 'rb') as f:
+            text = f.read().decode()
+
+        levels = []
+        level = []
+        for line in text.splitlines():
+            l = line.strip()
+            if l == "&":
+                levels.append('\n'.join(level))
+                level = []
+            else:
+                level.append(l)
+
+        levels.append('\n'.join(level))
+        return levels
@@ -0,0 +1,65 @@
+from math import floor
+from typing import Dict, Hashable, Iterator, Set, Tuple
+
+
+# Uniform grid over points. Inserting, moving, and removing a point is O(1),
+# and a rectangle query only visits the cells the rectangle overlaps (or the
+# occupied cells, whichever is fewer).
+class GridIndex:
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self.positions: Dict[Hashable, Tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.positions
+
+    def __cell(self, x: float, y: float) -> Tuple[int, int]:
+        return floor(x / self.cell_size), floor(y / self.cell_size)
+
+    def insert(self, key: Hashable, x: float, y: float):
+        assert key not in self.positions
+        self.positions[key] = (x, y)
+        self.cells.setdefault(self.__cell(x, y), set()).add(key)
+
+    def remove(self, key: Hashable):
+        x, y = self.positions.pop(key)
+        cell = self.__cell(x, y)
+        keys = self.cells[cell]
+        keys.remove(key)
+        if len(keys) == 0:
+            del self.cells[cell]
+
+    def move(self, key: Hashable, x: float, y: float):
+        old_x, old_y = self.positions[key]
+        if self.__cell(old_x, old_y) == self.__cell(x, y):
+            self.positions[key] = (x, y)
+        else:
+            self.remove(key)
+            self.insert(key, x, y)
+
+    def query(self, x1: float, y1: float, x2: float, y2: float) -> Iterator[Hashable]:
+        c_x1, c_y1 = self.__cell(x1, y1)
+        c_x2, c_y2 = self.__cell(x2, y2)
+
+        if (c_x2 - c_x1 + 1) * (c_y2 - c_y1 + 1) <= len(self.cells):
+            cells = (
+                (c_x, c_y)
+                for c_x in range(c_x1, c_x2 + 1)
+                for c_y in range(c_y1, c_y2 + 1)
+                if (c_x, c_y) in self.cells
+            )
+        else:
+            cells = (
+                cell for cell in self.cells
+                if c_x1 <= cell[0] <= c_x2 and c_y1 <= cell[1] <= c_y2
+            )
+
+        for cell in cells:
+            for key in self.cells[cell]:
+                x, y = self.positions[key]
+                if x1 <= x <= x2 and y1 <= y <= y2:
+                    yield key
@@ -0,0 +1,66 @@
+import json
+import os
+import stat
+
+import pytest
+
+from GDM.IO import write_graph_json
+from GDM.IO.AtomicFile import atomic_write
+
+
+def mode(path) -> int:
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+@pytest.fixture
+def umask_022():
+    old = os.umask(0o022)
+    yield
+    os.umask(old)
+
+@pytest.mark.parametrize('file_mode', [0o644, 0o640, 0o600])
+def test_rewrite_keeps_mode_and_replaces_content(tmp_path, file_mode):
+    path = tmp_path / 'graph.json'
+    path.write_text('old')
+    os.chmod(path, file_mode)
+
+    write_graph_json(str(path), {'scale': 0.5}, [('start', {'x': 0, 'y': 0, 'reward': 1, 'neighbors': []})])
+
+    assert mode(path) == file_mode
+    assert json.loads(path.read_text()) == {
+        'scale': 0.5, 'graph': {'start': {'x': 0, 'y': 0, 'reward': 1, 'neighbors': []}}
+    }
+    assert [p.name for p in tmp_path.iterdir()] == ['graph.json']
+
+def test_new_file_gets_default_mode(tmp_path, umask_022):
+    path = tmp_path / 'new.bin'
+    with atomic_write(str(path), 'wb') as f:
+        f.write(b'data')
+
+    assert mode(path) == 0o644
+    assert path.read_bytes() == b'data'
+
+def test_rewrite_through_symlink_keeps_link(tmp_path):
+    target = tmp_path / 'real.json'
+    target.write_text('old')
+    os.chmod(target, 0o644)
+    link = tmp_path / 'graph.json'
+    link.symlink_to(target)
+
+    with atomic_write(str(link)) as f:
+        f.write('new')
+
+    assert link.is_symlink()
+    assert target.read_text() == 'new'
+    assert mode(target) == 0o644
+
+def test_failed_write_keeps_old_file(tmp_path):
+    path = tmp_path / 'graph.json'
+    path.write_text('old')
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path)) as f:
+            f.write('new')
+            raise RuntimeError()
+
+    assert path.read_text() == 'old'
+    assert [p.name for p in tmp_path.iterdir()] == ['graph.json']
@@ -0,0 +1,77 @@
+import pytest
+
+from GDM.ADP import ChangeSet
+from GDM.Graph import CompactGraph, Graph
+from GDM.utility import calculate_utility
+
+
+def self_loop_graph(graph_type: type) -> Graph:
+    G = graph_type()
+    G.add_default_node('a')
+    G.add_default_node('b')
+    G.add_default_edge('a', 'a', [('a', 1.0)])
+    G.add_default_edge('a', 'b', [('b', 0.5), ('a', 0.5)])
+    G.add_default_edge('b', 'a', [('a', 1.0)])
+    G.add_default_edge('b', 'b', [('b', 0.5), ('a', 0.5)])
+    return G
+
+@pytest.mark.parametrize('graph_type', [Graph, CompactGraph])
+def test_remove_node_with_self_loop(graph_type):
+    G = self_loop_graph(graph_type)
+    G.remove_node('a')
+
+    assert list(G.nodes) == ['b']
+    assert list(G.edges) == [('b', 'b')]
+    assert G.get_edge('b', 'b').probability == [('b', 1.0)]
+    assert G.neighbors('b') == {'b'}
+    assert G.incoming_edges('b') == [G.get_edge('b', 'b')]
+    assert G.predecessors('a') == set()
+
+@pytest.mark.parametrize('graph_type', [Graph, CompactGraph])
+def test_change_set_remove_node_with_self_loop(graph_type):
+    G = self_loop_graph(graph_type)
+    changes = ChangeSet()
+    changes.remove_node(G, 'a')
+
+    assert changes.removed_nodes == {'a'}
+    assert changes.removed_edges == {('a', 'a'), ('a', 'b'), ('b', 'a')}
+    assert changes.changed_edges == {('b', 'b')}
+    assert list(G.edges) == [('b', 'b')]
+
+def chain(graph_type: type) -> Graph:
+    G = graph_type()
+    G.add_default_node('start', reward=0.0)
+    G.add_default_node('a', reward=1.0)
+    G.add_default_node('b', reward=2.0)
+    G.add_default_edge('start', 'a', [('a', 0.5), ('b', 0.5)])
+    return G
+
+@pytest.mark.parametrize('graph_type', [Graph, CompactGraph])
+def test_expected_reward_follows_reward_edits(graph_type):
+    G = chain(graph_type)
+    e = G.get_edge('start', 'a')
+    assert e.expected_reward(G) == 1.5
+    assert calculate_utility(G, 'start', 'a', 0.9) == 1.5
+
+    G.get_node('b').reward = 4.0
+    assert e.expected_reward(G) == 2.5
+    assert calculate_utility(G, 'start', 'a', 0.9) == 2.5
+
+    G.set_edge_probability('start', 'a', [('b', 1.0)])
+    assert e.expected_reward(G) == 4.0
+
+@pytest.mark.parametrize('graph_type', [Graph, CompactGraph])
+def test_reward_edits_only_invalidate_their_graph(graph_type):
+    G = chain(graph_type)
+    H = chain(graph_type)
+    version = G.reward_version
+
+    H.get_node('a').reward = 10.0
+    assert G.reward_version == version
+    assert H.get_edge('start', 'a').expected_reward(H) == 6.0
+
+    G.get_node('a').utility = 3.0
+    assert G.reward_version == version
+
+    G.get_node('a').reward = 3.0
+    assert G.reward_version != version
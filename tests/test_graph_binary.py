@@ -0,0 +1,110 @@
+import json
+
+import numpy as np
+
+from GDM.ADP import compiled_value_iteration
+from GDM.Graph import Graph
+from GDM.IO import binary_to_json, json_to_binary, read_graph_binary, write_graph_binary, write_graph_json
+from benchmarks.generators import layered_level_graph
+
+ARRAYS = [
+    'reward', 'utility', 'terminal', 'action_offsets', 'action_targets',
+    'transition_offsets', 'transition_targets', 'transition_probabilities',
+]
+
+
+def stochastic_graph() -> Graph:
+    return layered_level_graph(200, seed=4, outcomes=(1, 4), terminal_probability=0.1)
+
+def assert_same_arrays(C, C_read):
+    assert C_read.names == C.names
+    for key in ARRAYS:
+        assert np.array_equal(getattr(C_read, key), getattr(C, key)), key
+
+def test_binary_round_trip(tmp_path):
+    G = stochastic_graph()
+    for i, node in enumerate(G.nodes.values()):
+        node.utility = i / 10
+
+    C = G.compile()
+    positions = {name: (float(i), -2.5*i) for i, name in enumerate(C.names)}
+    path = str(tmp_path / 'graph.gdmb')
+    write_graph_binary(path, C, 1.25, positions)
+
+    C_read, metadata = read_graph_binary(path)
+    assert_same_arrays(C, C_read)
+    assert C_read.transition_count > C_read.action_count
+    assert metadata['scale'] == 1.25
+    assert metadata['x'].tolist() == [positions[name][0] for name in C.names]
+    assert metadata['y'].tolist() == [positions[name][1] for name in C.names]
+
+def test_binary_round_trip_without_positions(tmp_path):
+    C = stochastic_graph().compile()
+    path = str(tmp_path / 'graph.gdmb')
+    write_graph_binary(path, C)
+
+    C_read, metadata = read_graph_binary(path)
+    assert_same_arrays(C, C_read)
+    assert metadata == {'scale': 1.0}
+
+def test_json_binary_json_round_trip(tmp_path):
+    nodes = {
+        'start': {'x': 10.0, 'y': 20.5, 'reward': 0.0, 'neighbors': ['a', 'b']},
+        'a': {'x': -3.0, 'y': 7.0, 'reward': -1.5, 'neighbors': ['b', 'start']},
+        'b': {'x': 100.0, 'y': 0.25, 'reward': 2.0, 'neighbors': ['b']},
+        'end': {'x': 0.0, 'y': 0.0, 'reward': 5.0, 'neighbors': []},
+    }
+    json_path = str(tmp_path / 'graph.json')
+    binary_path = str(tmp_path / 'graph.gdmb')
+    out_path = str(tmp_path / 'out.json')
+    write_graph_json(json_path, {'scale': 0.75}, nodes.items())
+
+    json_to_binary(json_path, binary_path)
+    binary_to_json(binary_path, out_path)
+
+    with open(out_path) as f:
+        document = json.load(f)
+
+    assert document['scale'] == 0.75
+    assert list(document['graph']) == list(nodes)
+    for name, node in nodes.items():
+        out = document['graph'][name]
+        assert (out['x'], out['y'], out['reward']) == (node['x'], node['y'], node['reward'])
+        assert sorted(out['neighbors']) == sorted(node['neighbors'])
+
+def test_solver_runs_on_memory_mapped_graph(tmp_path):
+    G = stochastic_graph()
+    path = tmp_path / 'graph.gdmb'
+    write_graph_binary(str(path), G.compile())
+    written = path.read_bytes()
+
+    C, _ = read_graph_binary(str(path))
+    actions = compiled_value_iteration(C, 1000, 0.9, 1e-8)
+    expected = G.compile()
+    expected_actions = compiled_value_iteration(expected, 1000, 0.9, 1e-8)
+
+    assert np.array_equal(actions, expected_actions)
+    assert np.array_equal(C.utility, expected.utility)
+    assert np.any(C.utility != 0)
+    assert path.read_bytes() == written
+
+def test_empty_graph(tmp_path):
+    binary_path = str(tmp_path / 'graph.gdmb')
+    write_graph_binary(binary_path, Graph().compile(), 2.0, {})
+
+    C, metadata = read_graph_binary(binary_path)
+    assert C.names == []
+    assert C.node_count == C.action_count == C.transition_count == 0
+    assert metadata['scale'] == 2.0
+    assert len(metadata['x']) == len(metadata['y']) == 0
+    assert len(compiled_value_iteration(C, 10, 0.9, 1e-8)) == 0
+
+    json_path = str(tmp_path / 'graph.json')
+    binary_to_json(binary_path, json_path)
+    with open(json_path) as f:
+        assert json.load(f) == {'scale': 2.0, 'graph': {}}
+
+    json_to_binary(json_path, binary_path)
+    C, metadata = read_graph_binary(binary_path)
+    assert C.node_count == 0
+    assert metadata['scale'] == 2.0
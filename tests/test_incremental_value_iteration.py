@@ -0,0 +1,57 @@
+import pytest
+
+from GDM.ADP import ChangeSet, incremental_value_iteration, prioritized_value_iteration, value_iteration
+from GDM.Graph import Graph
+
+GAMMA = 0.9
+THETA = 1e-10
+TOLERANCE = 1e-7
+
+
+def diamond() -> Graph:
+    G = Graph()
+    G.add_default_node('start', reward=0.0)
+    G.add_default_node('a', reward=1.0)
+    G.add_default_node('b', reward=2.0)
+    G.add_default_node('end', reward=3.0, terminal=True)
+    G.add_default_edge('start', 'a', [('a', 1.0)])
+    G.add_default_edge('start', 'b', [('b', 0.8), ('a', 0.2)])
+    G.add_default_edge('a', 'end', [('end', 1.0)])
+    G.add_default_edge('b', 'end', [('end', 1.0)])
+    return G
+
+def assert_matches_full_solve(G: Graph, pi):
+    expected = Graph()
+    for name, node in G.nodes.items():
+        expected.add_default_node(name, node.reward, terminal=node.is_terminal)
+    for e in G.edges.values():
+        expected.add_default_edge(e.src, e.tgt, list(e.probability))
+
+    expected_pi = value_iteration(expected, 10_000, GAMMA, THETA, backend='numpy')
+    assert pi == expected_pi
+    for name in G.nodes:
+        assert G.utility(name) == pytest.approx(expected.utility(name), abs=TOLERANCE)
+
+def test_removing_last_edge_makes_a_dead_end():
+    G = diamond()
+    pi = prioritized_value_iteration(G, GAMMA, THETA)
+    assert pi == {'start': 'b', 'a': 'end', 'b': 'end'}
+
+    changes = ChangeSet()
+    changes.remove_edge(G, 'b', 'end')
+    pi = incremental_value_iteration(G, GAMMA, THETA, changes, pi)
+
+    assert 'b' not in pi
+    assert G.utility('b') == 0
+    assert pi == {'start': 'a', 'a': 'end'}
+    assert_matches_full_solve(G, pi)
+
+def test_reward_and_edge_changes_match_full_solve():
+    G = diamond()
+    pi = prioritized_value_iteration(G, GAMMA, THETA)
+
+    changes = ChangeSet()
+    changes.set_reward(G, 'a', 5.0)
+    changes.remove_node(G, 'b')
+    pi = incremental_value_iteration(G, GAMMA, THETA, changes, pi)
+    assert_matches_full_solve(G, pi)
@@ -0,0 +1,30 @@
+from segment_store import SegmentStore
+
+
+def test_reads_segments_split_on_ampersand_lines(tmp_path):
+    (tmp_path / 'a.txt').write_bytes(b'ab\ncd\n&\nef\r\n gh \n')
+    (tmp_path / 'empty.txt').write_bytes(b'')
+    store = SegmentStore(str(tmp_path))
+
+    assert store.get('a') == ['ab\ncd', 'ef\ngh']
+    assert store.get('empty') == ['']
+    assert store.get('missing') == []
+    store.shutdown()
+
+def test_cache_keeps_the_most_recent_levels(tmp_path):
+    for name in ('a', 'b', 'c'):
+        (tmp_path / f'{name}.txt').write_text(name)
+
+    store = SegmentStore(str(tmp_path), capacity=2)
+    assert store.get('a') == ['a']
+    assert store.get('b') == ['b']
+
+    # the cached copy is returned even after the file changes
+    (tmp_path / 'a.txt').write_text('changed')
+    assert store.get('a') == ['a']
+
+    # a is more recent than b, so b is evicted and read again
+    assert store.get('c') == ['c']
+    (tmp_path / 'b.txt').write_text('changed')
+    assert store.get('b') == ['changed']
+    store.shutdown()
@@ -0,0 +1,163 @@
+from random import Random
+
+import pytest
+
+from GDM.ADP import (
+    batched_value_iteration, policy_iteration, prioritized_value_iteration, topological_value_iteration, value_iteration
+)
+from GDM.Graph import CompactGraph, Graph
+from benchmarks.generators import layered_level_graph
+
+GAMMA = 0.9
+THETA = 1e-10
+MAX_ITERATION = 10_000
+TOLERANCE = 1e-7
+
+DEAD_ENDS = 5
+
+
+# Like the graphs of test_value_iteration, plus a few dead ends: nodes that
+# are not terminal but lost all their edges, which every solver treats as a
+# utility of 0 without an action.
+def random_graph(seed: int, graph_type: type=Graph, nodes: int=200) -> Graph:
+    G = layered_level_graph(nodes, seed, layer_width=10, fan_out=(1, 4), outcomes=(1, 4),
+                            slip=0.3, back_edge_probability=0.2, terminal_probability=0.1,
+                            graph_type=graph_type)
+
+    candidates = sorted(n for n, node in G.nodes.items() if n != 'start' and not node.is_terminal)
+    for name in Random(seed).sample(candidates, DEAD_ENDS):
+        for tgt in list(G.neighbors(name)):
+            G.remove_edge(name, tgt)
+
+    return G
+
+# The reference every solver is compared with.
+def solve(G: Graph):
+    return value_iteration(G, MAX_ITERATION, GAMMA, THETA, backend='numpy')
+
+def assert_same_solution(G: Graph, pi, G_expected: Graph, pi_expected):
+    assert pi == pi_expected
+    for name, node in G_expected.nodes.items():
+        assert G.utility(name) == pytest.approx(node.utility, abs=TOLERANCE)
+
+# Single node components with and without a self loop, a dead end, and a
+# terminal node.
+def self_loop_graph(graph_type: type=Graph) -> Graph:
+    G = graph_type()
+    G.add_default_node('start', reward=0.0)
+    G.add_default_node('a', reward=1.0)
+    G.add_default_node('b', reward=-1.0)
+    G.add_default_node('dead', reward=4.0)
+    G.add_default_node('end', reward=2.0, terminal=True)
+    G.add_default_edge('start', 'a', [('a', 1.0)])
+    G.add_default_edge('start', 'b', [('b', 0.7), ('dead', 0.3)])
+    G.add_default_edge('a', 'a', [('a', 0.5), ('end', 0.5)])
+    G.add_default_edge('a', 'end', [('end', 1.0)])
+    G.add_default_edge('b', 'end', [('b', 0.4), ('end', 0.6)])
+    return G
+
+@pytest.fixture(params=[Graph, CompactGraph])
+def graph_type(request):
+    return request.param
+
+def test_random_graph_has_dead_ends_and_terminal_nodes():
+    G = random_graph(0)
+    pi = solve(G)
+    dead_ends = [n for n, node in G.nodes.items() if not node.is_terminal and len(node.neighbors) == 0]
+    assert len(dead_ends) == DEAD_ENDS
+    assert any(node.is_terminal for node in G.nodes.values())
+    assert all(n not in pi and G.utility(n) == 0 for n in dead_ends)
+
+######################## Policy Iteration ########################
+@pytest.mark.parametrize('solver', ['direct', 'iterative'])
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_exact_policy_iteration_matches_value_iteration(graph_type, solver, seed):
+    G_expected = random_graph(seed, graph_type)
+    pi_expected = solve(G_expected)
+
+    G = random_graph(seed, graph_type)
+    pi = policy_iteration(G, GAMMA, exact=True, solver=solver)
+    assert_same_solution(G, pi, G_expected, pi_expected)
+
+# enough evaluation steps for the utilities to converge within TOLERANCE
+@pytest.mark.parametrize('modified', [False, True])
+@pytest.mark.parametrize('in_place', [False, True])
+def test_policy_iteration_matches_value_iteration(graph_type, modified, in_place):
+    G_expected = random_graph(3, graph_type, nodes=60)
+    pi_expected = solve(G_expected)
+
+    G = random_graph(3, graph_type, nodes=60)
+    pi = policy_iteration(G, GAMMA, modified, in_place, policy_k=300)
+    assert_same_solution(G, pi, G_expected, pi_expected)
+
+######################## Prioritized Value Iteration ########################
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_prioritized_value_iteration_matches_value_iteration(graph_type, seed):
+    G_expected = random_graph(seed, graph_type)
+    pi_expected = solve(G_expected)
+
+    G = random_graph(seed, graph_type)
+    pi = prioritized_value_iteration(G, GAMMA, THETA)
+    assert_same_solution(G, pi, G_expected, pi_expected)
+
+######################## Topological Value Iteration ########################
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_topological_value_iteration_matches_value_iteration(graph_type, seed):
+    G_expected = random_graph(seed, graph_type)
+    pi_expected = solve(G_expected)
+
+    G = random_graph(seed, graph_type)
+    pi = topological_value_iteration(G, MAX_ITERATION, GAMMA, THETA)
+    assert_same_solution(G, pi, G_expected, pi_expected)
+
+def test_topological_value_iteration_with_self_loops(graph_type):
+    G_expected = self_loop_graph(graph_type)
+    pi_expected = solve(G_expected)
+    assert pi_expected['a'] == 'a'
+
+    G = self_loop_graph(graph_type)
+    pi = topological_value_iteration(G, MAX_ITERATION, GAMMA, THETA)
+    assert_same_solution(G, pi, G_expected, pi_expected)
+
+######################## Batched Value Iteration ########################
+GAMMAS = [0.5, 0.8, 0.9, 0.99]
+
+def reward_presets(G: Graph, seed: int):
+    rng = Random(seed)
+    names = sorted(G.nodes)
+    return [{name: rng.uniform(-2, 2) for name in rng.sample(names, len(names) // 4)} for _ in GAMMAS]
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_batched_value_iteration_matches_separate_solves(graph_type, seed):
+    G = random_graph(seed, graph_type)
+    presets = reward_presets(G, seed)
+    policies, utilities = batched_value_iteration(G, MAX_ITERATION, GAMMAS, THETA, presets)
+    assert all(node.utility == 0 for node in G.nodes.values())
+
+    for gamma, preset, pi, u in zip(GAMMAS, presets, policies, utilities):
+        G_expected = random_graph(seed, graph_type)
+        for name, reward in preset.items():
+            G_expected.get_node(name).reward = reward
+
+        pi_expected = value_iteration(G_expected, MAX_ITERATION, gamma, THETA, backend='numpy')
+        assert pi == pi_expected
+        for name, node in G_expected.nodes.items():
+            assert u[name] == pytest.approx(node.utility, abs=TOLERANCE)
+
+def test_batched_value_iteration_shares_gamma_and_rewards(graph_type):
+    G_expected = self_loop_graph(graph_type)
+    pi_expected = solve(G_expected)
+
+    policies, utilities = batched_value_iteration(self_loop_graph(graph_type), MAX_ITERATION,
+                                                  GAMMA, THETA, [{}, {}])
+    assert policies == [pi_expected, pi_expected]
+    for u in utilities:
+        for name, node in G_expected.nodes.items():
+            assert u[name] == pytest.approx(node.utility, abs=TOLERANCE)
+
+    policies, _ = batched_value_iteration(self_loop_graph(graph_type), MAX_ITERATION, GAMMA, THETA)
+    assert policies == [pi_expected]
+
+def test_batched_value_iteration_rejects_mismatched_problems():
+    with pytest.raises(ValueError):
+        batched_value_iteration(self_loop_graph(), MAX_ITERATION, GAMMAS, THETA, [{}, {}])
@@ -0,0 +1,56 @@
+import pytest
+
+from GDM.ADP import value_iteration
+from GDM.Graph import CompactGraph, Graph
+from benchmarks.generators import layered_level_graph
+
+GAMMA = 0.9
+THETA = 1e-10
+MAX_ITERATION = 10_000
+
+# the backends sum in a different order, and in place sweeps visit the nodes in
+# a different order, so utilities only agree up to about theta / (1 - gamma)
+TOLERANCE = 1e-7
+
+
+# Stochastic edges with up to 4 outcomes, back edges (cycles), and terminal
+# nodes scattered through the layers.
+def random_graph(seed: int, graph_type: type) -> Graph:
+    return layered_level_graph(300, seed, layer_width=12, fan_out=(1, 4), outcomes=(1, 4),
+                               slip=0.3, back_edge_probability=0.2, terminal_probability=0.1,
+                               graph_type=graph_type)
+
+@pytest.mark.parametrize('graph_type', [Graph, CompactGraph])
+@pytest.mark.parametrize('in_place', [False, True])
+@pytest.mark.parametrize('block_size', [1024, 7])
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_numpy_backend_matches_python(graph_type, in_place, block_size, seed):
+    G_python = random_graph(seed, graph_type)
+    G_numpy = random_graph(seed, graph_type)
+    assert any(len(e.probability) > 1 for e in G_python.edges.values())
+    assert any(n.is_terminal for n in G_python.nodes.values())
+
+    pi_python = value_iteration(G_python, MAX_ITERATION, GAMMA, THETA, in_place)
+    pi_numpy = value_iteration(G_numpy, MAX_ITERATION, GAMMA, THETA, in_place,
+                               backend='numpy', block_size=block_size)
+
+    assert pi_numpy == pi_python
+    for name, node in G_python.nodes.items():
+        assert G_numpy.utility(name) == pytest.approx(node.utility, abs=TOLERANCE)
+
+def test_terminal_nodes_have_no_action_and_zero_utility():
+    G = Graph()
+    G.add_default_node('start', reward=0.0)
+    G.add_default_node('a', reward=-1.0)
+    G.add_default_node('end', reward=5.0, terminal=True)
+    G.add_default_edge('start', 'a', [('a', 0.5), ('end', 0.5)])
+    G.add_default_edge('start', 'end', [('end', 1.0)])
+    G.add_default_edge('a', 'start', [('start', 1.0)])
+    G.add_default_edge('end', 'start', [('start', 1.0)])
+
+    for backend in ('python', 'numpy'):
+        pi = value_iteration(G, MAX_ITERATION, GAMMA, THETA, backend=backend)
+        assert pi == {'start': 'end', 'a': 'start'}
+        assert G.utility('end') == 0
+        assert G.utility('start') == pytest.approx(5.0)
+        assert G.utility('a') == pytest.approx(GAMMA * 5.0)